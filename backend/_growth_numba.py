@@ -0,0 +1,149 @@
+"""Numba kernels for growth.py.
+
+Compiled, row-parallel versions of the two per-anomaly computations there:
+  - growth_columns_kernel: the five calculate_growth_rates columns
+    (remaining wall, remaining life, growth class, risk score, risk
+    category) from one read of each row's depth and growth rate.
+  - fit_trends_kernel: the 3-run linear fit and acceleration test of
+    predict_growth_trends (masked means, (co)variances, slope, intercept,
+    r and the acceleration flag) in one fused loop.
+Both replace chains of full-size NumPy temporaries. Loaded by growth.py
+via _numba_support.
+
+The trend covariance sums are the one place a fast-math flag is set:
+"contract", so they accumulate as fused multiply-adds the way the BLAS dot
+behind np.cov does.
+"""
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(parallel=True, cache=True)
+def growth_columns_kernel(depth, rate, repair_threshold, max_rate, depth_scale, rate_scale,
+                          remaining_wall, remaining_life, growth_code, risk_score, risk_code):
+    """Fill the five growth columns for each (depth, rate) pair.
+
+    growth_code / risk_code index growth._GROWTH_LABELS / growth._RISK_LABELS,
+    with len(labels) meaning "Unknown" (missing rate / score).
+    """
+    for i in prange(depth.shape[0]):
+        d = depth[i]
+        r = rate[i]
+        remaining_wall[i] = 100.0 - d
+
+        # Remaining life: NaN unless growing; 0 once past the threshold
+        capacity = repair_threshold - d
+        if r > 0:
+            remaining_life[i] = 0.0 if capacity <= 0 else np.round(capacity / r, 1)
+        else:
+            remaining_life[i] = np.nan
+
+        if np.isnan(r):
+            growth_code[i] = 6
+        elif r < 0:
+            growth_code[i] = 0
+        elif r == 0:
+            growth_code[i] = 1
+        elif r <= 1.0:
+            growth_code[i] = 2
+        elif r <= 3.0:
+            growth_code[i] = 3
+        elif r <= max_rate:
+            growth_code[i] = 4
+        else:
+            growth_code[i] = 5
+
+        # Missing depth counts as 0; missing / negative rates contribute nothing
+        d_pos = 0.0 if np.isnan(d) else d
+        r_pos = r if r > 0 else 0.0
+        score = np.round(min(50.0, d_pos * depth_scale) + min(50.0, r_pos * rate_scale), 1)
+        risk_score[i] = score
+
+        if np.isnan(score):
+            risk_code[i] = 4
+        elif score < 30.0:
+            risk_code[i] = 0
+        elif score < 50.0:
+            risk_code[i] = 1
+        elif score < 70.0:
+            risk_code[i] = 2
+        else:
+            risk_code[i] = 3
+
+
+@njit(cache=True, fastmath={"contract"})
+def _deviation_sums(depths, years, i, x_mean, y_mean):
+    """Sums of dx*dx, dx*dy, dy*dy over row i's valid depths."""
+    sxx = 0.0
+    sxy = 0.0
+    syy = 0.0
+    for k in range(3):
+        d = depths[i, k]
+        if not np.isnan(d):
+            dx = years[k] - x_mean
+            dy = d - y_mean
+            sxx += dx * dx
+            sxy += dx * dy
+            syy += dy * dy
+    return sxx, sxy, syy
+
+
+@njit(parallel=True, cache=True)
+def fit_trends_kernel(depths, years, gap_early, gap_late, slope, intercept, r_value, accel):
+    """Fill slope / intercept / r_value / accel for each row of `depths`.
+
+    depths is (N, 3) with NaN for missing runs; rows with fewer than two
+    valid depths get NaN fits. accel follows the closed-form test in
+    predict_growth_trends (False unless all three depths are present).
+    """
+    for i in prange(depths.shape[0]):
+        n = 0
+        sx = 0.0
+        sy = 0.0
+        for k in range(3):
+            d = depths[i, k]
+            if not np.isnan(d):
+                n += 1
+                sx += years[k]
+                sy += d
+        accel[i] = False
+        if n < 2:
+            slope[i] = np.nan
+            intercept[i] = np.nan
+            r_value[i] = np.nan
+            continue
+
+        x_mean = sx / n
+        y_mean = sy / n
+        sxx, sxy, syy = _deviation_sums(depths, years, i, x_mean, y_mean)
+        inv_n = 1.0 / n
+        ssxm = sxx * inv_n
+        ssxym = sxy * inv_n
+        ssym = syy * inv_n
+
+        b = ssxym / ssxm
+        slope[i] = b
+        intercept[i] = y_mean - b * x_mean
+        if ssym == 0.0:
+            # Flat depths have no defined correlation (linregress: NaN)
+            r_value[i] = np.nan if ssxym == 0.0 else 0.0
+        else:
+            r = ssxym / np.sqrt(ssxm * ssym)
+            r_value[i] = min(max(r, -1.0), 1.0)
+
+        if n == 3:
+            accel[i] = (gap_early * (depths[i, 2] - depths[i, 1])
+                        > gap_late * (depths[i, 1] - depths[i, 0]))
+
+
+def warmup():
+    """Compile both kernels on a single row."""
+    growth_columns_kernel(
+        np.zeros(1), np.zeros(1), 1.0, 1.0, 1.0, 1.0,
+        np.empty(1), np.empty(1), np.empty(1, dtype=np.int8), np.empty(1), np.empty(1, dtype=np.int8),
+    )
+    fit_trends_kernel(
+        np.full((1, 3), np.nan), np.array([0.0, 1.0, 2.0]), 1.0, 1.0,
+        np.empty(1), np.empty(1), np.empty(1), np.empty(1, dtype=np.bool_),
+    )
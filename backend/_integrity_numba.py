@@ -0,0 +1,74 @@
+"""Numba kernels for integrity_analytics.py.
+
+  - segment_stats_kernel: the per-segment reductions of
+    segment_risk_analysis (max depth, growth-rate sum / count and critical
+    count) in one pass over the distance-sorted anomalies.
+  - interaction_chain_kernel: the ASME B31G forward-chaining walk of
+    interaction_assessment, over distance-sorted anomaly arrays.
+Loaded by integrity_analytics.py via _numba_support.
+
+The loops are serial so segment sums accumulate in row order, as
+np.add.reduceat does. Both kernels release the GIL (nogil) so the
+dashboard's analytics can run on parallel threads.
+"""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True, nogil=True)
+def segment_stats_kernel(edges, depth, rate, is_critical,
+                         max_depth, rate_sum, rate_count, critical_count):
+    """Reduce rows edges[s]:edges[s + 1] into segment `s`.
+
+    The output arrays are sized len(edges) - 1 and must come in zeroed,
+    except max_depth which starts as NaN (NaN depths are skipped). Only
+    non-negative growth rates count towards rate_sum / rate_count.
+    """
+    for s in range(edges.shape[0] - 1):
+        for i in range(edges[s], edges[s + 1]):
+            d = depth[i]
+            if d > max_depth[s] or np.isnan(max_depth[s]):
+                max_depth[s] = d
+            r = rate[i]
+            if r >= 0:
+                rate_sum[s] += r
+                rate_count[s] += 1
+            if is_critical[i]:
+                critical_count[s] += 1
+
+
+@njit(cache=True, nogil=True)
+def interaction_chain_kernel(dist, length_in, wall_in, starts, stops):
+    """Find the interacting clusters along sorted distances `dist`.
+
+    Writes each cluster's [start, stop) row range into `starts` / `stops`
+    (both sized len(dist)) and returns the number of clusters. length_in and
+    wall_in must already have their defaults filled in.
+    """
+    n = dist.shape[0]
+    n_clusters = 0
+    i = 0
+    while i < n:
+        threshold_ft = (6 * wall_in[i]) / 12.0
+        own_length_ft = length_in[i] / 12.0
+        last_dist = dist[i]
+        j = i + 1
+        while j < n and (dist[j] - last_dist) - own_length_ft <= threshold_ft:
+            last_dist = dist[j]
+            j += 1
+        if j - i >= 2:
+            starts[n_clusters] = i
+            stops[n_clusters] = j
+            n_clusters += 1
+        i = j
+    return n_clusters
+
+
+def warmup():
+    """Compile both kernels on one-segment / two-anomaly inputs."""
+    segment_stats_kernel(np.array([0, 1]), np.zeros(1), np.zeros(1), np.zeros(1, dtype=np.bool_),
+                         np.full(1, np.nan), np.zeros(1),
+                         np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.int64))
+    interaction_chain_kernel(np.zeros(2), np.zeros(2), np.full(2, 0.3),
+                             np.empty(2, dtype=np.int64), np.empty(2, dtype=np.int64))
@@ -0,0 +1,41 @@
+"""Numba kernel for the girth-weld distance correction.
+
+Parallel, compiled version of alignment.piecewise_linear: each row does a
+binary search over the girth-weld distances and a linear interpolation
+(np.interp in range, the end segments extended outside it), split across
+threads with prange. Loaded by alignment.py via _numba_support.
+"""
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(parallel=True, cache=True)
+def piecewise_linear_kernel(x, xp, fp, out):
+    """Fill `out` with the piecewise linear map of `x` through (xp, fp).
+
+    xp must be increasing with at least 2 points; points outside its range
+    are extrapolated along the first / last segment; NaN stays NaN.
+    """
+    n = xp.shape[0]
+    for i in prange(x.shape[0]):
+        v = x[i]
+        if np.isnan(v):
+            out[i] = np.nan
+        elif v < xp[0]:
+            out[i] = fp[0] + (fp[1] - fp[0]) / (xp[1] - xp[0]) * (v - xp[0])
+        elif v > xp[n - 1]:
+            out[i] = fp[n - 1] + (fp[n - 1] - fp[n - 2]) / (xp[n - 1] - xp[n - 2]) * (v - xp[n - 1])
+        elif v == xp[n - 1]:
+            out[i] = fp[n - 1]
+        else:
+            k = np.searchsorted(xp, v, side="right") - 1
+            if v == xp[k]:
+                out[i] = fp[k]
+            else:
+                out[i] = (fp[k + 1] - fp[k]) / (xp[k + 1] - xp[k]) * (v - xp[k]) + fp[k]
+
+
+def warmup():
+    """Compile the kernel on a one-point input."""
+    piecewise_linear_kernel(np.zeros(1), np.array([0.0, 1.0]), np.array([0.0, 1.0]), np.empty(1))
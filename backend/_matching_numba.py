@@ -0,0 +1,51 @@
+"""Numba kernel for matching.py.
+
+Compiled version of the match confidence model of matching._compute_confidence:
+the similarity, uniqueness, growth-plausibility and joint-agreement factors
+and their weighted blend, in one loop over the accepted matches. Loaded
+by matching.py via _numba_support.
+"""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def confidence_kernel(similarity, n_candidates, d_later, d_earlier, jn_later, jn_earlier,
+                      years_between, max_growth_rate, out):
+    """Fill `out` with the (unrounded) confidence of each match."""
+    for k in range(similarity.shape[0]):
+        # Factor 2: uniqueness
+        n = n_candidates[k]
+        if n <= 1:
+            f_unique = 1.0
+        elif n == 2:
+            f_unique = 0.7
+        else:
+            f_unique = max(0.3, 1.0 - n * 0.1)
+
+        # Factor 3: growth plausibility
+        if not np.isnan(d_later[k]) and not np.isnan(d_earlier[k]) and years_between > 0:
+            growth_rate = (d_later[k] - d_earlier[k]) / years_between
+            if 0 <= growth_rate <= max_growth_rate:
+                f_plaus = 1.0
+            elif growth_rate < 0:
+                f_plaus = max(0.0, 0.5 + growth_rate / 10.0)
+            else:
+                f_plaus = max(0.2, 1.0 - (growth_rate - max_growth_rate) / 10.0)
+        else:
+            f_plaus = 0.5
+
+        # Factor 4: joint number agreement
+        if not np.isnan(jn_later[k]) and not np.isnan(jn_earlier[k]):
+            f_joint = 1.0 if int(jn_later[k]) == int(jn_earlier[k]) else 0.6
+        else:
+            f_joint = 0.5
+
+        out[k] = 0.40 * similarity[k] + 0.25 * f_unique + 0.20 * f_plaus + 0.15 * f_joint
+
+
+def warmup():
+    """Compile the kernel on a single match."""
+    confidence_kernel(np.ones(1), np.ones(1, dtype=np.int64), np.zeros(1), np.zeros(1),
+                      np.zeros(1), np.zeros(1), 1.0, 5.0, np.empty(1))
@@ -0,0 +1,31 @@
+"""Loader for the optional numba kernel modules.
+
+The ``_*_numba`` modules hold compiled versions of hot loops in alignment,
+growth, matching and integrity_analytics. Each kernel mirrors the NumPy
+code it replaces term for term, with fastmath off (the one exception is
+noted in _growth_numba), so the compiled and NumPy paths give bit-identical
+results and callers use whichever is available.
+
+load_kernels() imports one of those modules and runs its warmup(), which
+compiles the kernels (or loads them from numba's on-disk cache) so the
+first request doesn't pay the JIT latency. If numba is missing, or a kernel
+fails to type or compile on this platform, it returns None and the caller
+keeps its NumPy path.
+"""
+
+import importlib
+import warnings
+from types import ModuleType
+
+
+def load_kernels(module_name: str) -> ModuleType | None:
+    """Import and warm up the kernel module `module_name`; None if unusable."""
+    try:
+        module = importlib.import_module(module_name)
+        module.warmup()
+    except ImportError:
+        return None
+    except Exception as e:  # numba typing / lowering / cache errors
+        warnings.warn(f"{module_name} unavailable, using the NumPy path: {e}", RuntimeWarning)
+        return None
+    return module
@@ -16,34 +16,54 @@ an API key.
 import os
 import re
 import json
-from typing import Optional
+import functools
+import threading
+from typing import AsyncIterator, Optional
 from pathlib import Path
 
 import numpy as np
 import pandas as pd
 
+from data_ingestion import summarize_run
+
 try:
-    from openai import OpenAI
+    from openai import OpenAI, AsyncOpenAI
     HAS_OPENAI = True
 except ImportError:
     HAS_OPENAI = False
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
 
 # ---------------------------------------------------------------------------
 # API key loading -- checks .env file in the backend directory first, then
 # falls back to the XAI_API_KEY environment variable. This two-tier lookup
 # lets developers store the key in .env locally while still supporting
-# deployment via environment variables.
+# deployment via environment variables. The file is read line by line and
+# the scan stops at the first non-empty XAI_API_KEY entry (commented-out
+# lines never match because they start with "#").
 # ---------------------------------------------------------------------------
+@functools.lru_cache(maxsize=None)
 def _load_env_key() -> str:
     env_path = Path(__file__).parent / ".env"
     if env_path.exists():
-        for line in env_path.read_text().splitlines():
-            line = line.strip()
-            if line.startswith("XAI_API_KEY=") and not line.startswith("#"):
-                val = line.split("=", 1)[1].strip().strip('"').strip("'")
-                if val:
-                    return val
+        with env_path.open() as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("XAI_API_KEY="):
+                    val = line.split("=", 1)[1].strip().strip('"').strip("'")
+                    if val:
+                        return val
     return os.environ.get("XAI_API_KEY", "")
 
 # Module-level state: loaded once at import, but can be overwritten at
@@ -53,57 +73,180 @@ XAI_BASE_URL = "https://api.x.ai/v1"
 MODEL = "grok-4-1-fast"
 
 
+# Validation state of the active key: "unverified" until a background check
+# has run, then "valid" or "invalid"; "validating" while that check is in
+# flight, and "" when no key is configured.
+_KEY_STATUS = "unverified" if XAI_API_KEY else ""
+
+# True when the last key passed to set_api_key() was rejected by the
+# background check and the previous configuration was restored.
+_KEY_REJECTED = False
+
+# (key, client, status) to restore if the key being validated is rejected:
+# the last configuration whose validation had settled.
+_PREVIOUS_KEY = ("", None, "")
+
+# Guards the key state above: set_api_key() runs on request threads and
+# _validate_key_bg() on a daemon thread.
+_KEY_LOCK = threading.Lock()
+
+
 # ---------------------------------------------------------------------------
 # Runtime API key configuration.
-# Accepts a new key from the frontend settings panel, validates it by making
-# a lightweight test completion call, and updates the module-level key only
-# on success. If the test call fails with a non-auth error (e.g. network
-# timeout, rate limit), the key is still accepted because it may be valid.
+# Accepts a new key from the frontend settings panel optimistically: after a
+# format sanity check the key becomes active immediately, and a lightweight
+# test completion call runs on a background thread. If that call fails with
+# an authentication / bad-request error the previous key and its client are
+# restored; any other failure (e.g. network timeout, rate limit) leaves the
+# new key in place, because it may be valid. get_api_key_status() reports
+# the outcome.
 # ---------------------------------------------------------------------------
 def set_api_key(key: str) -> dict:
-    """Set the xAI API key at runtime after validating it with a test call."""
-    global XAI_API_KEY
+    """Set the xAI API key at runtime; validation runs in the background."""
+    global XAI_API_KEY, _KEY_STATUS, _KEY_REJECTED, _PREVIOUS_KEY
+    key = (key or "").strip()
     if not key:
         return {"configured": False, "error": "No key provided"}
-    if not HAS_OPENAI:
-        XAI_API_KEY = key
-        return {"configured": True, "model": MODEL, "error": None}
-
-    # Validate by making a lightweight test call
+    if not key.startswith("xai-"):
+        return {"configured": False, "error": 'Invalid API key. Make sure it starts with "xai-".'}
+    with _KEY_LOCK:
+        _KEY_REJECTED = False
+        if not HAS_OPENAI:
+            XAI_API_KEY = key
+            _KEY_STATUS = "unverified"
+            return {"configured": True, "model": MODEL, "status": _KEY_STATUS, "error": None}
+
+        if _KEY_STATUS != "validating":
+            # A key still being checked is never a fallback; keep the one before it
+            _PREVIOUS_KEY = (XAI_API_KEY, _CLIENT_CACHE.get(XAI_API_KEY), _KEY_STATUS)
+        _swap_client(key, _CLIENT_CACHE.get(key) or _new_client(key))
+        _KEY_STATUS = "validating"
+    threading.Thread(target=_validate_key_bg, args=(key,), daemon=True).start()
+    return {"configured": True, "model": MODEL, "status": "validating", "error": None}
+
+
+def _validate_key_bg(key: str) -> None:
+    """Make a lightweight test call with `key` and record the outcome."""
+    global XAI_API_KEY, _KEY_STATUS, _KEY_REJECTED
+    status = "valid"
     try:
-        test_client = OpenAI(api_key=key, base_url=XAI_BASE_URL)
-        test_client.chat.completions.create(
+        (_CLIENT_CACHE.get(key) or _new_client(key)).chat.completions.create(
             model=MODEL,
             max_tokens=5,
             messages=[{"role": "user", "content": "Hi"}],
         )
-        XAI_API_KEY = key
-        return {"configured": True, "model": MODEL, "error": None}
     except Exception as e:
         err = str(e)
         # Only reject the key on clear authentication / bad-request errors
         if "Incorrect API key" in err or "invalid" in err.lower() or "401" in err or "400" in err:
-            return {"configured": False, "error": "Invalid API key. Get yours at https://console.x.ai"}
-        # Other errors (network, rate limit) — key might be fine, accept it
-        XAI_API_KEY = key
-        return {"configured": True, "model": MODEL, "error": None}
+            status = "invalid"
+        else:
+            # Other errors (network, rate limit) — key might be fine, keep it
+            status = "unverified"
+    with _KEY_LOCK:
+        if XAI_API_KEY != key:
+            return  # superseded by a newer set_api_key() call
+        if status != "invalid":
+            _KEY_STATUS = status
+            return
+        _KEY_REJECTED = True
+        prev_key, prev_client, prev_status = _PREVIOUS_KEY
+        if prev_key and prev_key != key:
+            _swap_client(prev_key, prev_client or _new_client(prev_key))
+            _KEY_STATUS = prev_status
+        else:
+            XAI_API_KEY = ""
+            _CLIENT_CACHE.pop(key, None)
+            _ASYNC_CLIENT_CACHE.pop(key, None)
+            _KEY_STATUS = ""
 
 
 def get_api_key_status() -> dict:
-    """Return whether the API key is configured and the model in use."""
-    return {"configured": bool(XAI_API_KEY), "model": MODEL}
+    """Return whether the API key is configured, its validation status and the model in use.
+
+    `rejected` is True when the last key set was rejected and the previous
+    configuration restored.
+    """
+    return {"configured": bool(XAI_API_KEY), "model": MODEL, "status": _KEY_STATUS,
+            "rejected": _KEY_REJECTED}
 
 
 # ---------------------------------------------------------------------------
 # Client factory.
-# Creates a fresh OpenAI-compatible client on every call instead of caching
-# a singleton, so that runtime key changes made via set_api_key() take
-# effect immediately without restarting the server.
+# One OpenAI-compatible client is kept per API key so that every LLM call
+# reuses the same httpx connection pool (keep-alive, no repeated TLS
+# handshakes). set_api_key() swaps in the client for the new key and drops
+# the old one (kept aside in case the new key is rejected), so runtime key
+# changes still take effect immediately without restarting the server. The
+# AsyncOpenAI clients used by the ``*_async`` entry points are cached the
+# same way.
 # ---------------------------------------------------------------------------
+_CLIENT_CACHE: dict[str, "OpenAI"] = {}
+_ASYNC_CLIENT_CACHE: dict[str, "AsyncOpenAI"] = {}
+
+
+def _new_client(key: str) -> "OpenAI":
+    return OpenAI(api_key=key, base_url=XAI_BASE_URL)
+
+
+def _swap_client(key: str, client: "OpenAI") -> None:
+    """Make `key` the active API key, caching `client` and dropping the old one."""
+    global XAI_API_KEY
+    old_key = XAI_API_KEY
+    _CLIENT_CACHE[key] = client
+    XAI_API_KEY = key
+    if old_key != key:
+        # Not closed explicitly: in-flight requests may still hold it
+        _CLIENT_CACHE.pop(old_key, None)
+        _ASYNC_CLIENT_CACHE.pop(old_key, None)
+
+
 def _get_client() -> Optional["OpenAI"]:
     if not HAS_OPENAI or not XAI_API_KEY:
         return None
-    return OpenAI(api_key=XAI_API_KEY, base_url=XAI_BASE_URL)
+    client = _CLIENT_CACHE.get(XAI_API_KEY)
+    if client is None:
+        client = _CLIENT_CACHE[XAI_API_KEY] = _new_client(XAI_API_KEY)
+    return client
+
+
+def _get_async_client() -> Optional["AsyncOpenAI"]:
+    if not HAS_OPENAI or not XAI_API_KEY:
+        return None
+    client = _ASYNC_CLIENT_CACHE.get(XAI_API_KEY)
+    if client is None:
+        client = AsyncOpenAI(api_key=XAI_API_KEY, base_url=XAI_BASE_URL)
+        _ASYNC_CLIENT_CACHE[XAI_API_KEY] = client
+    return client
+
+
+# ---------------------------------------------------------------------------
+# Context memoization.
+# The context strings below only change when the analysis pipeline rewrites
+# the cache, yet chat(), the report and the fallbacks rebuild them on every
+# request. Built strings are stored per (cache identity, cache["version"],
+# builder, args); the pipeline bumps cache["version"] and calls
+# invalidate_context_cache() whenever it swaps in new results.
+# ---------------------------------------------------------------------------
+_CONTEXT_CACHE: dict[tuple, str] = {}
+
+
+def invalidate_context_cache() -> None:
+    """Drop all memoized context strings (call after the cache is rewritten)."""
+    _CONTEXT_CACHE.clear()
+
+
+def _memoized_context(builder):
+    """Memoize a context builder on the identity and version of its cache."""
+    @functools.wraps(builder)
+    def wrapper(cache: dict, *args, **kwargs) -> str:
+        key = (id(cache), cache.get("version", 0), builder.__name__,
+               args, tuple(sorted(kwargs.items())))
+        if key not in _CONTEXT_CACHE:
+            _CONTEXT_CACHE[key] = builder(cache, *args, **kwargs)
+        return _CONTEXT_CACHE[key]
+    return wrapper
+
 
 # ---------------------------------------------------------------------------
 # Context builders -- these functions assemble plain-text summaries of the
@@ -111,7 +254,34 @@ def _get_client() -> Optional["OpenAI"]:
 # can reason about the pipeline data without needing direct data access.
 # ---------------------------------------------------------------------------
 
+# Shared read-only default for missing frames in the cache, so lookups don't
+# construct a fresh empty DataFrame each time
+_EMPTY_DF = pd.DataFrame()
+
+
+def _rate_stats(mr: dict) -> Optional[dict]:
+    """Mean/max/negative-count of depth growth rates for one pairwise result.
 
+    Memoized on the match-result dict itself, which is replaced wholesale
+    whenever the pipeline re-runs. Returns None when there are no rates.
+    """
+    if "rate_stats" not in mr:
+        matches = mr.get("matches", _EMPTY_DF)
+        stats = None
+        if not matches.empty and "depth_growth_rate" in matches.columns:
+            rates = matches["depth_growth_rate"].dropna()
+            if len(rates) > 0:
+                stats = {"mean": rates.mean(), "max": rates.max(), "negative": int((rates < 0).sum())}
+        mr["rate_stats"] = stats
+    return mr["rate_stats"]
+
+
+# Caps on how much of the analysis is spelled out in the pipeline context
+_MAX_PAIRWISE_SECTIONS = 8
+_MAX_LIFECYCLE_ROWS = 50
+
+
+@_memoized_context
 def _build_pipeline_context(cache: dict) -> str:
     """
     Assemble a structured text summary of all analysis results for the LLM.
@@ -120,16 +290,21 @@ def _build_pipeline_context(cache: dict) -> str:
     pairwise match counts with confidence breakdown and growth rate
     statistics, and multi-run chain tracking (triple matches, lifecycle).
     """
+    runs = cache.get("runs")
+    if not runs:
+        return "## CorroSight - Pipeline Data Summary\nNo inspection data loaded."
     parts = []
 
     # Summary
-    runs = cache.get("runs", {})
+    # Per-run counts are precomputed at load time; fill in (and keep) any
+    # that are missing, e.g. for caches built outside the server startup path
+    summaries = cache.setdefault("run_summaries", {})
     parts.append("## CorroSight - Pipeline Data Summary")
     for year in sorted(runs.keys()):
-        df = runs[year]
-        anom_count = df["is_anomaly"].sum() if "is_anomaly" in df.columns else 0
-        gw_count = df["is_girth_weld"].sum() if "is_girth_weld" in df.columns else 0
-        parts.append(f"- {year}: {len(df)} total rows, {anom_count} anomalies, {gw_count} girth welds")
+        if year not in summaries:
+            summaries[year] = summarize_run(runs[year])
+        s = summaries[year]
+        parts.append(f"- {year}: {s['rows']} total rows, {s['anom']} anomalies, {s['gw']} girth welds")
 
     # Alignment stats
     astats = cache.get("alignment_stats", {})
@@ -142,11 +317,19 @@ def _build_pipeline_context(cache: dict) -> str:
     # Pairwise match stats (one section per year-pair)
     results = cache.get("results", {})
     pairwise = results.get("pairwise", {})
-    for (ye, yl), mr in pairwise.items():
-        stats = mr.get("stats", {})
-        matches = mr.get("matches", pd.DataFrame())
-        new_anom = mr.get("new_anomalies", pd.DataFrame())
-        missing = mr.get("missing_anomalies", pd.DataFrame())
+    pair_items = list(pairwise.items())
+    # Beyond a handful of year-pairs, keep full sections for the most recent
+    # ones and collapse the rest into one line each to bound prompt size
+    if len(pair_items) > _MAX_PAIRWISE_SECTIONS:
+        earlier = pair_items[:-_MAX_PAIRWISE_SECTIONS]
+        pair_items = pair_items[-_MAX_PAIRWISE_SECTIONS:]
+        parts.append(f"\n## Earlier Matching Pairs")
+        for (ye, yl), mr in earlier:
+            parts.append(f"- {ye} to {yl}: {len(mr.get('matches', _EMPTY_DF))} matches")
+    for (ye, yl), mr in pair_items:
+        matches = mr.get("matches", _EMPTY_DF)
+        new_anom = mr.get("new_anomalies", _EMPTY_DF)
+        missing = mr.get("missing_anomalies", _EMPTY_DF)
         parts.append(f"\n## Matching: {ye} to {yl}")
         parts.append(f"- Matches found: {len(matches)}")
         parts.append(f"- New anomalies in {yl}: {len(new_anom)}")
@@ -154,29 +337,30 @@ def _build_pipeline_context(cache: dict) -> str:
         if not matches.empty and "confidence_label" in matches.columns:
             conf_counts = matches["confidence_label"].value_counts().to_dict()
             parts.append(f"- Confidence breakdown: {conf_counts}")
-        if not matches.empty and "depth_growth_rate" in matches.columns:
-            rates = matches["depth_growth_rate"].dropna()
-            if len(rates) > 0:
-                parts.append(f"- Mean growth rate: {rates.mean():.3f} %/yr")
-                parts.append(f"- Max growth rate: {rates.max():.3f} %/yr")
-                parts.append(f"- Negative growth (apparent shrinkage): {(rates < 0).sum()} anomalies")
+        rate_stats = _rate_stats(mr)
+        if rate_stats:
+            parts.append(f"- Mean growth rate: {rate_stats['mean']:.3f} %/yr")
+            parts.append(f"- Max growth rate: {rate_stats['max']:.3f} %/yr")
+            parts.append(f"- Negative growth (apparent shrinkage): {rate_stats['negative']} anomalies")
 
     # Multi-run chain summary (anomalies tracked across all 3 inspections)
     chain = results.get("chain", {})
-    triple = chain.get("triple_matches", pd.DataFrame())
-    lifecycle = chain.get("lifecycle_summary", pd.DataFrame())
+    triple = chain.get("triple_matches", _EMPTY_DF)
+    lifecycle = chain.get("lifecycle_summary", _EMPTY_DF)
     if not triple.empty:
         parts.append(f"\n## Multi-Run Tracking (3 inspections)")
         parts.append(f"- Anomalies tracked across all 3 runs: {len(triple)}")
         if "overall_growth_rate" in triple.columns:
             parts.append(f"- Mean overall growth rate: {triple['overall_growth_rate'].mean():.3f} %/yr")
     if not lifecycle.empty:
-        for _, row in lifecycle.iterrows():
-            parts.append(f"- {row['Category']}: {row['Count']}")
+        lifecycle = lifecycle[lifecycle["Count"] > 0].head(_MAX_LIFECYCLE_ROWS)
+        for category, count in zip(lifecycle["Category"], lifecycle["Count"]):
+            parts.append(f"- {category}: {count}")
 
     return "\n".join(parts)
 
 
+@_memoized_context
 def _build_top_concerns_context(cache: dict, n: int = 20) -> str:
     """
     Format the top N highest-risk anomalies as a numbered list for the LLM.
@@ -185,30 +369,34 @@ def _build_top_concerns_context(cache: dict, n: int = 20) -> str:
     include joint number, distance, clock position, depth, growth rate,
     remaining life estimate, and risk category.
     """
-    results = cache.get("results", {})
-    pairwise = results.get("pairwise", {})
+    if not cache.get("runs"):
+        return ""
+    pairwise = cache.get("results", {}).get("pairwise")
+    if not pairwise:
+        return ""
     parts = []
 
     for (ye, yl), mr in pairwise.items():
-        matches = mr.get("matches", pd.DataFrame())
+        matches = mr.get("matches", _EMPTY_DF)
         if matches.empty or "risk_score" not in matches.columns:
             continue
-        top_n = matches.nlargest(n, "risk_score")
+        top_n = _top_by_risk(matches, n)
         parts.append(f"\n## Top {n} Concerns ({ye}-{yl})")
-        for i, (_, row) in enumerate(top_n.iterrows(), 1):
-            parts.append(
-                f"{i}. Joint {row.get('later_joint', '?')}, "
-                f"Dist {row.get('later_distance', 0):.0f} ft, "
-                f"Clock {row.get('later_clock', 0):.1f}, "
-                f"Depth {row.get('later_depth_pct', 0):.1f}%, "
-                f"Rate {row.get('depth_growth_rate', 0):.2f} %/yr, "
-                f"Remaining life {row.get('remaining_life_years', 'N/A')} yr, "
-                f"Risk: {row.get('risk_category', 'Unknown')}"
-            )
+        lines = (
+            _numbering(top_n) + ". Joint " + _col(top_n, "later_joint", "?").astype(str)
+            + ", Dist " + _col(top_n, "later_distance", 0).map("{:.0f}".format)
+            + " ft, Clock " + _col(top_n, "later_clock", 0).map("{:.1f}".format)
+            + ", Depth " + _col(top_n, "later_depth_pct", 0).map("{:.1f}".format)
+            + "%, Rate " + _col(top_n, "depth_growth_rate", 0).map("{:.2f}".format)
+            + " %/yr, Remaining life " + _col(top_n, "remaining_life_years", "N/A").astype(str)
+            + " yr, Risk: " + _col(top_n, "risk_category", "Unknown").astype(str)
+        )
+        parts.extend(lines.tolist())
 
     return "\n".join(parts)
 
 
+@_memoized_context
 def _build_trajectory_context(cache: dict) -> str:
     """
     Format the top 10 fastest-growing triple-match anomalies for the LLM.
@@ -217,50 +405,111 @@ def _build_trajectory_context(cache: dict) -> str:
     overall growth rate, 2030 prediction, and whether growth is
     accelerating between inspection intervals.
     """
+    if not cache.get("runs"):
+        return ""
     results = cache.get("results", {})
     chain = results.get("chain", {})
-    triple = chain.get("triple_matches", pd.DataFrame())
+    triple = chain.get("triple_matches", _EMPTY_DF)
     if triple.empty:
         return ""
 
     parts = ["## Multi-Run Growth Trajectories"]
     if "overall_growth_rate" in triple.columns:
         top10 = triple.nlargest(10, "overall_growth_rate")
-        for i, (_, row) in enumerate(top10.iterrows(), 1):
-            parts.append(
-                f"{i}. Joint {row.get('joint_2022', '?')}: "
-                f"2007={row.get('depth_2007', '?')}% -> "
-                f"2015={row.get('depth_2015', '?')}% -> "
-                f"2022={row.get('depth_2022', '?')}%, "
-                f"Rate: {row.get('overall_growth_rate', 0):.3f} %/yr, "
-                f"Predicted 2030: {row.get('predicted_2030', 'N/A')}%, "
-                f"Accelerating: {row.get('is_accelerating', False)}"
-            )
+        lines = (
+            _numbering(top10) + ". Joint " + _col(top10, "joint_2022", "?").astype(str)
+            + ": 2007=" + _col(top10, "depth_2007", "?").astype(str)
+            + "% -> 2015=" + _col(top10, "depth_2015", "?").astype(str)
+            + "% -> 2022=" + _col(top10, "depth_2022", "?").astype(str)
+            + "%, Rate: " + _col(top10, "overall_growth_rate", 0).map("{:.3f}".format)
+            + " %/yr, Predicted 2030: " + _col(top10, "predicted_2030", "N/A").astype(str)
+            + "%, Accelerating: " + _col(top10, "is_accelerating", False).astype(str)
+        )
+        parts.extend(lines.tolist())
 
     return "\n".join(parts)
 
 
-# ── Public API ───────────────────────────────────────────────────────────────
+def _to_json(obj) -> str:
+    """Serialize a prompt payload to compact JSON text.
 
-def chat(message: str, history: list[dict], cache: dict) -> str:
+    No indentation or separator whitespace: it only adds prompt tokens.
+    Uses orjson when installed (several times faster than the stdlib and
+    serializes numpy scalars natively); falls back to json.dumps otherwise.
+    Unknown types are stringified.
     """
-    Handle a chat message with full pipeline context.
+    if HAS_ORJSON:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        return orjson.dumps(obj, default=str, option=option).decode()
+    return json.dumps(obj, separators=(",", ":"), default=str)
 
-    Builds a system prompt containing the complete pipeline analysis context
-    (run summary, top concerns, growth trajectories), appends the last 10
-    messages of chat history for conversational continuity, and sends
-    everything to the LLM. Falls back to _fallback_chat() when no API key
-    is configured, providing regex-routed data-driven answers instead.
+
+_DECODER = json.JSONDecoder()
+
+
+def _extract_json(text: str, open_char: str = "["):
+    """Decode the first JSON array/object in an LLM response (may be wrapped in markdown).
+
+    Parses in place from the first `open_char` with raw_decode, so trailing
+    prose is ignored without scanning or slicing the rest of the response.
+    Returns None if no value is found or it fails to decode.
     """
-    client = _get_client()
-    if client is None:
-        return _fallback_chat(message, cache)
+    i = text.find(open_char)
+    if i < 0:
+        return None
+    try:
+        obj, _ = _DECODER.raw_decode(text, i)
+        return obj
+    except json.JSONDecodeError:
+        return None
+
+
+def _col(df: pd.DataFrame, name: str, default) -> pd.Series:
+    """Return column `name`, or a constant Series of `default` if it is absent."""
+    if name in df.columns:
+        return df[name]
+    return pd.Series(default, index=df.index)
+
+
+def _top_by_risk(matches: pd.DataFrame, n: int) -> pd.DataFrame:
+    """Return the n highest-risk_score rows, highest first (same rows as nlargest).
 
+    The server caches each pair's matches already sorted by risk_score, so
+    this is normally just head(n); frames from any other writer fall back
+    to nlargest.
+    """
+    if matches["risk_score"].is_monotonic_decreasing:
+        return matches.head(n)
+    return matches.nlargest(n, "risk_score")
+
+
+def _numbering(df: pd.DataFrame) -> pd.Series:
+    """Return 1-based list numbers ("1", "2", ...) aligned to df's index."""
+    return pd.Series(range(1, len(df) + 1), index=df.index).astype(str)
+
+
+# ── Public API ───────────────────────────────────────────────────────────────
+# Each LLM feature is split into a request builder (prompt + create() kwargs)
+# and a response parser, shared by a blocking variant that uses the cached
+# OpenAI client and an ``*_async`` variant that awaits AsyncOpenAI. The async
+# variants let the API layer serve report, narratives, insights and NL-chart
+# requests concurrently on the event loop instead of one worker thread each.
+
+@_memoized_context
+def _chat_system_prompt(cache: dict) -> str:
+    """
+    The chat system prompt: role, full pipeline context and guidelines.
+
+    Built once per cache version so every chat turn sends a byte-identical
+    leading message. Providers cache prompt prefixes automatically, so only
+    the history and the new user message are processed from scratch; keep
+    anything turn-specific (timestamps, the question itself) out of here.
+    """
     context = _build_pipeline_context(cache)
     concerns = _build_top_concerns_context(cache)
     trajectories = _build_trajectory_context(cache)
 
-    system_prompt = f"""You are an expert pipeline integrity engineer AI assistant. You have access to the complete analysis results from 3 In-Line Inspection (ILI) runs on a pipeline (2007, 2015, 2022).
+    return f"""You are an expert pipeline integrity engineer AI assistant. You have access to the complete analysis results from 3 In-Line Inspection (ILI) runs on a pipeline (2007, 2015, 2022).
 
 Your role: Help engineers understand their pipeline data, identify risks, and make informed integrity decisions. Be precise with numbers and always cite specific data.
 
@@ -278,38 +527,58 @@ Guidelines:
 - If asked about something not in the data, say so clearly
 - Keep responses concise but thorough"""
 
-    messages = [{"role": "system", "content": system_prompt}]
+
+def _chat_request(message: str, history: list[dict], cache: dict) -> dict:
+    """Build the create() kwargs for a chat turn with full pipeline context."""
+    messages = [{"role": "system", "content": _chat_system_prompt(cache)}]
     # Include last 10 messages of history for conversational context
     for h in history[-10:]:
         messages.append({"role": h["role"], "content": h["content"]})
     messages.append({"role": "user", "content": message})
+    # Route turns against the same data version to the same prompt cache
+    headers = {"x-grok-conv-id": f"corrosight-chat-{cache.get('version', 0)}"}
+    return {"model": MODEL, "max_tokens": 2048, "messages": messages,
+            "extra_headers": headers}
+
+
+def chat(message: str, history: list[dict], cache: dict) -> str:
+    """
+    Handle a chat message with full pipeline context.
+
+    Builds a system prompt containing the complete pipeline analysis context
+    (run summary, top concerns, growth trajectories), appends the last 10
+    messages of chat history for conversational continuity, and sends
+    everything to the LLM. Falls back to _fallback_chat() when no API key
+    is configured, providing regex-routed data-driven answers instead.
+    """
+    client = _get_client()
+    if client is None:
+        return _fallback_chat(message, cache)
 
+    request = _chat_request(message, history, cache)
     try:
-        response = client.chat.completions.create(
-            model=MODEL,
-            max_tokens=2048,
-            messages=messages,
-        )
+        response = client.chat.completions.create(**request)
         return response.choices[0].message.content
     except Exception as e:
         return f"AI service error: {str(e)}"
 
 
-def generate_executive_report(cache: dict) -> str:
-    """
-    Generate a comprehensive executive summary report.
-
-    Sends a structured prompt to the LLM requesting a professional
-    pipeline integrity assessment covering: executive summary, inspection
-    overview, alignment/matching results, corrosion growth trends, critical
-    findings with specific joint citations, prioritized repair actions,
-    and next-inspection timing recommendations. Falls back to a plain
-    template report when no API key is available.
-    """
-    client = _get_client()
+async def chat_async(message: str, history: list[dict], cache: dict) -> str:
+    """Async variant of chat() using the shared AsyncOpenAI client."""
+    client = _get_async_client()
     if client is None:
-        return _fallback_report(cache)
+        return _fallback_chat(message, cache)
+
+    request = _chat_request(message, history, cache)
+    try:
+        response = await client.chat.completions.create(**request)
+        return response.choices[0].message.content
+    except Exception as e:
+        return f"AI service error: {str(e)}"
+
 
+def _report_request(cache: dict) -> dict:
+    """Build the create() kwargs for the executive summary report."""
     context = _build_pipeline_context(cache)
     concerns = _build_top_concerns_context(cache)
     trajectories = _build_trajectory_context(cache)
@@ -335,79 +604,113 @@ Data:
 
 Format: Use markdown headers and bullet points. Include specific numbers. Keep the total report under 1500 words."""
 
+    return {"model": MODEL, "max_tokens": 3000,
+            "messages": [{"role": "user", "content": prompt}]}
+
+
+def generate_executive_report(cache: dict) -> str:
+    """
+    Generate a comprehensive executive summary report.
+
+    Sends a structured prompt to the LLM requesting a professional
+    pipeline integrity assessment covering: executive summary, inspection
+    overview, alignment/matching results, corrosion growth trends, critical
+    findings with specific joint citations, prioritized repair actions,
+    and next-inspection timing recommendations. Falls back to a plain
+    template report when no API key is available.
+    """
+    client = _get_client()
+    if client is None:
+        return _fallback_report(cache)
+
+    request = _report_request(cache)
     try:
-        response = client.chat.completions.create(
-            model=MODEL,
-            max_tokens=3000,
-            messages=[{"role": "user", "content": prompt}],
-        )
+        response = client.chat.completions.create(**request)
         return response.choices[0].message.content
     except Exception as e:
         return f"Report generation error: {str(e)}"
 
 
-def generate_anomaly_narratives(cache: dict, n: int = 20) -> list[dict]:
-    """
-    Batch-generate AI narrative "story cards" for the top N anomalies.
+async def generate_executive_report_async(cache: dict) -> str:
+    """Async variant of generate_executive_report()."""
+    client = _get_async_client()
+    if client is None:
+        return _fallback_report(cache)
 
-    Collects the top 20 (by risk_score) anomalies from the latest pairwise
-    match set, enriches each with 3-run depth history from triple matches
-    when available, and sends all of them in a single LLM call. The LLM
-    returns a JSON array of {joint, narrative} objects which are merged
-    back onto the source anomaly data. Falls back to template-based
-    narratives when no API key is configured.
+    request = _report_request(cache)
+    try:
+        response = await client.chat.completions.create(**request)
+        return response.choices[0].message.content
+    except Exception as e:
+        return f"Report generation error: {str(e)}"
+
+
+def _collect_narrative_anomalies(cache: dict, n: int) -> list[dict]:
     """
-    client = _get_client()
+    Collect the top N (by risk_score) anomalies for narrative generation.
 
+    Uses the latest pairwise match set and enriches each anomaly with its
+    3-run depth history from triple matches when available.
+    """
     results = cache.get("results", {})
     pairwise = results.get("pairwise", {})
     chain = results.get("chain", {})
-    triple = chain.get("triple_matches", pd.DataFrame())
+    triple = chain.get("triple_matches", _EMPTY_DF)
 
     # Collect top concerns from the latest pair (2015-2022)
     key = (2015, 2022)
     if key not in pairwise:
-        key = list(pairwise.keys())[-1] if pairwise else None
+        key = next(reversed(pairwise), None)
     if key is None:
         return []
 
-    matches = pairwise[key].get("matches", pd.DataFrame())
+    matches = pairwise[key].get("matches", _EMPTY_DF)
     if matches.empty or "risk_score" not in matches.columns:
         return []
 
-    top = matches.nlargest(n, "risk_score")
-    anomaly_data = []
-    for _, row in top.iterrows():
-        d = {
-            "joint": _safe_val(row.get("later_joint")),
-            "distance_ft": _safe_val(row.get("later_distance")),
-            "clock": _safe_val(row.get("later_clock")),
-            "depth_pct": _safe_val(row.get("later_depth_pct")),
-            "earlier_depth_pct": _safe_val(row.get("earlier_depth_pct")),
-            "growth_rate": _safe_val(row.get("depth_growth_rate")),
-            "remaining_life_years": _safe_val(row.get("remaining_life_years")),
-            "risk_score": _safe_val(row.get("risk_score")),
-            "risk_category": row.get("risk_category", "Unknown"),
-            "confidence": row.get("confidence_label", "Unknown"),
-            "event_type": row.get("later_event_type", row.get("event_type", "Metal Loss")),
-        }
-        # Enrich with 3-run history if this anomaly was tracked across all runs
-        if not triple.empty:
-            j = row.get("later_joint")
-            triple_match = triple[triple["joint_2022"] == j]
-            if not triple_match.empty:
-                tm = triple_match.iloc[0]
-                d["depth_2007"] = _safe_val(tm.get("depth_2007"))
-                d["depth_2015"] = _safe_val(tm.get("depth_2015"))
-                d["predicted_2030"] = _safe_val(tm.get("predicted_2030"))
-                d["is_accelerating"] = bool(tm.get("is_accelerating", False))
-        anomaly_data.append(d)
+    top = _top_by_risk(matches, n)
+    # Sanitize whole columns once instead of calling _safe_val per cell
+    if "later_event_type" in top.columns:
+        event_type = top["later_event_type"]
+    else:
+        event_type = _col(top, "event_type", "Metal Loss")
+    columns = {
+        "joint": _safe_column(_col(top, "later_joint", None)),
+        "distance_ft": _safe_column(_col(top, "later_distance", None)),
+        "clock": _safe_column(_col(top, "later_clock", None)),
+        "depth_pct": _safe_column(_col(top, "later_depth_pct", None)),
+        "earlier_depth_pct": _safe_column(_col(top, "earlier_depth_pct", None)),
+        "growth_rate": _safe_column(_col(top, "depth_growth_rate", None)),
+        "remaining_life_years": _safe_column(_col(top, "remaining_life_years", None)),
+        "risk_score": _safe_column(_col(top, "risk_score", None)),
+        "risk_category": _col(top, "risk_category", "Unknown").tolist(),
+        "confidence": _col(top, "confidence_label", "Unknown").tolist(),
+        "event_type": event_type.tolist(),
+    }
+    anomaly_data = [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+    # Enrich with 3-run history for anomalies tracked across all runs, via one
+    # joint-indexed lookup (first triple match per joint) instead of a scan per row
+    if not triple.empty and "later_joint" in top.columns:
+        history = triple.drop_duplicates("joint_2022").set_index("joint_2022")
+        tracked = top["later_joint"].isin(history.index).tolist()
+        hist = history.reindex(top["later_joint"])
+        depth_2007 = _safe_column(hist["depth_2007"])
+        depth_2015 = _safe_column(hist["depth_2015"])
+        predicted_2030 = _safe_column(_col(hist, "predicted_2030", None))
+        accelerating = _col(hist, "is_accelerating", False).tolist()
+        for i, d in enumerate(anomaly_data):
+            if tracked[i]:
+                d["depth_2007"] = depth_2007[i]
+                d["depth_2015"] = depth_2015[i]
+                d["predicted_2030"] = predicted_2030[i]
+                d["is_accelerating"] = bool(accelerating[i])
+    return anomaly_data
 
-    if client is None:
-        return _fallback_narratives(anomaly_data)
 
-    # Build a single batched prompt
-    anomaly_list_str = json.dumps(anomaly_data, indent=2, default=str)
+def _narratives_request(anomaly_data: list[dict]) -> dict:
+    """Build the create() kwargs for the single batched narratives call."""
+    anomaly_list_str = _to_json(anomaly_data)
     prompt = f"""You are a pipeline integrity engineer. For each of the following high-risk anomalies, write a 2-3 sentence narrative "story card" that explains:
 - The anomaly's history and evolution across inspections
 - Its current risk level and why it's concerning
@@ -418,47 +721,72 @@ Return a JSON array of objects with "joint" and "narrative" keys. Each narrative
 Anomalies:
 {anomaly_list_str}"""
 
-    try:
-        response = client.chat.completions.create(
-            model=MODEL,
-            max_tokens=4000,
-            messages=[{"role": "user", "content": prompt}],
-        )
-        # Extract the JSON array from the response (may be wrapped in markdown)
-        text = response.choices[0].message.content
-        start = text.find("[")
-        end = text.rfind("]") + 1
-        if start >= 0 and end > start:
-            narratives = json.loads(text[start:end])
-        else:
-            narratives = [{"joint": d["joint"], "narrative": "Narrative generation failed."} for d in anomaly_data]
-        # Merge LLM-generated narratives back onto the source anomaly data
-        result = []
-        narrative_map = {str(n.get("joint")): n.get("narrative", "") for n in narratives}
-        for d in anomaly_data:
-            d["narrative"] = narrative_map.get(str(d["joint"]), "")
-            result.append(d)
-        return result
+    return {"model": MODEL, "max_tokens": 4000,
+            "messages": [{"role": "user", "content": prompt}]}
 
-    except Exception as e:
-        return _fallback_narratives(anomaly_data)
 
+def _merge_narratives(text: str, anomaly_data: list[dict]) -> list[dict]:
+    """Parse the LLM's JSON array and merge narratives onto the anomaly data."""
+    narratives = _extract_json(text, "[")
+    if not isinstance(narratives, list):
+        narratives = [{"joint": d["joint"], "narrative": "Narrative generation failed."} for d in anomaly_data]
+    return _apply_narratives(narratives, anomaly_data)
 
-def generate_chart_insights(chart_type: str, data: dict, cache: dict) -> list[dict]:
+
+def _apply_narratives(narratives: list[dict], anomaly_data: list[dict]) -> list[dict]:
+    """Merge LLM-generated {joint, narrative} objects back onto the source anomaly data."""
+    result = []
+    narrative_map = {str(n.get("joint")): n.get("narrative", "") for n in narratives}
+    for d in anomaly_data:
+        d["narrative"] = narrative_map.get(str(d["joint"]), "")
+        result.append(d)
+    return result
+
+
+def generate_anomaly_narratives(cache: dict, n: int = 20) -> list[dict]:
     """
-    Generate AI-powered annotations for a specific chart.
+    Batch-generate AI narrative "story cards" for the top N anomalies.
 
-    Sends chart type and a truncated data summary to the LLM, asking it to
-    identify the top 3-5 most important patterns (outliers, clusters,
-    trends, danger zones). Returns a list of Plotly annotation objects
-    with text, x/y positions, and arrow settings ready for overlay on the
-    chart. Falls back to a placeholder annotation when no API key.
+    Collects the top 20 (by risk_score) anomalies from the latest pairwise
+    match set, enriches each with 3-run depth history from triple matches
+    when available, and sends all of them in a single LLM call. The LLM
+    returns a JSON array of {joint, narrative} objects which are merged
+    back onto the source anomaly data. Falls back to template-based
+    narratives when no API key is configured.
     """
     client = _get_client()
+    anomaly_data = _collect_narrative_anomalies(cache, n)
+    if not anomaly_data:
+        return []
     if client is None:
-        return _fallback_insights(chart_type, data, cache)
+        return _fallback_narratives(anomaly_data)
+
+    try:
+        response = client.chat.completions.create(**_narratives_request(anomaly_data))
+        return _merge_narratives(response.choices[0].message.content, anomaly_data)
+    except Exception as e:
+        return _fallback_narratives(anomaly_data)
+
+
+async def generate_anomaly_narratives_async(cache: dict, n: int = 20) -> list[dict]:
+    """Async variant of generate_anomaly_narratives()."""
+    client = _get_async_client()
+    anomaly_data = _collect_narrative_anomalies(cache, n)
+    if not anomaly_data:
+        return []
+    if client is None:
+        return _fallback_narratives(anomaly_data)
+
+    try:
+        response = await client.chat.completions.create(**_narratives_request(anomaly_data))
+        return _merge_narratives(response.choices[0].message.content, anomaly_data)
+    except Exception:
+        return _fallback_narratives(anomaly_data)
 
-    data_summary = json.dumps(data, indent=2, default=str)[:3000]
+
+def _insights_request(chart_type: str, data: dict) -> dict:
+    """Build the create() kwargs for a chart-insights call."""
+    data_summary = _to_json(data)[:3000]
 
     prompt = f"""You are a pipeline integrity data analyst. Analyze the following chart data and identify the top 3-5 most important patterns, anomalies, or insights.
 
@@ -474,58 +802,77 @@ Return a JSON array of Plotly annotation objects. Each must have:
 
 Focus on: outliers, clusters, trends, danger zones, and actionable findings."""
 
-    try:
-        response = client.chat.completions.create(
-            model=MODEL,
-            max_tokens=1500,
-            messages=[{"role": "user", "content": prompt}],
-        )
-        text = response.choices[0].message.content
-        start = text.find("[")
-        end = text.rfind("]") + 1
-        if start >= 0 and end > start:
-            return json.loads(text[start:end])
-        return []
-    except Exception:
-        return _fallback_insights(chart_type, data, cache)
+    return {"model": MODEL, "max_tokens": 1500,
+            "messages": [{"role": "user", "content": prompt}]}
 
 
-def generate_nl_chart(query: str, cache: dict) -> dict:
+def _parse_insights(text: str) -> list[dict]:
+    """Extract the JSON array of Plotly annotations from the LLM response."""
+    annotations = _extract_json(text, "[")
+    return annotations if isinstance(annotations, list) else []
+
+
+def generate_chart_insights(chart_type: str, data: dict, cache: dict) -> list[dict]:
     """
-    Generate a Plotly chart configuration from a natural-language request.
+    Generate AI-powered annotations for a specific chart.
 
-    Describes all available data columns (per-run and match columns) to
-    the LLM and asks it to produce a complete Plotly.js-compatible JSON
-    config ({data, layout, data_query}) that answers the user's question.
-    Returns an error dict when no API key is available, since there is no
-    meaningful regex-based fallback for arbitrary chart generation.
+    Sends chart type and a truncated data summary to the LLM, asking it to
+    identify the top 3-5 most important patterns (outliers, clusters,
+    trends, danger zones). Returns a list of Plotly annotation objects
+    with text, x/y positions, and arrow settings ready for overlay on the
+    chart. Falls back to a placeholder annotation when no API key.
     """
     client = _get_client()
     if client is None:
-        return {"error": "AI service not available. Set XAI_API_KEY environment variable."}
+        return _fallback_insights(chart_type, data, cache)
+
+    request = _insights_request(chart_type, data)
+    try:
+        response = client.chat.completions.create(**request)
+        return _parse_insights(response.choices[0].message.content)
+    except Exception:
+        return _fallback_insights(chart_type, data, cache)
 
+
+async def generate_chart_insights_async(chart_type: str, data: dict, cache: dict) -> list[dict]:
+    """Async variant of generate_chart_insights()."""
+    client = _get_async_client()
+    if client is None:
+        return _fallback_insights(chart_type, data, cache)
+
+    request = _insights_request(chart_type, data)
+    try:
+        response = await client.chat.completions.create(**request)
+        return _parse_insights(response.choices[0].message.content)
+    except Exception:
+        return _fallback_insights(chart_type, data, cache)
+
+
+def _nl_chart_request(query: str, cache: dict) -> dict:
+    """Build the create() kwargs for natural-language chart generation."""
     # Describe available data columns so the LLM knows what it can plot
     runs = cache.get("runs", {})
     columns_info = {}
     for year in sorted(runs.keys()):
-        columns_info[str(year)] = list(runs[year].columns)
+        columns_info[str(year)] = ",".join(map(str, runs[year].columns))
 
     results = cache.get("results", {})
     pairwise = results.get("pairwise", {})
     match_cols = []
     for key, mr in pairwise.items():
-        m = mr.get("matches", pd.DataFrame())
+        m = mr.get("matches", _EMPTY_DF)
         if not m.empty:
-            match_cols = list(m.columns)
+            match_cols = list(m.columns)[:30]
             break
+    match_cols_str = ",".join(map(str, match_cols))
 
     prompt = f"""You are a data visualization expert. Generate a Plotly.js chart configuration from this natural language request.
 
 User request: "{query}"
 
 Available data columns:
-- Run data per year (2007, 2015, 2022): {json.dumps(columns_info)}
-- Match data columns: {json.dumps(match_cols[:30])}
+- Run data per year (2007, 2015, 2022): {_to_json(columns_info)}
+- Match data columns: {match_cols_str}
 
 Return a JSON object with:
 - "data": array of Plotly trace objects
@@ -534,27 +881,294 @@ Return a JSON object with:
 
 Only return the JSON object, nothing else. Make the chart visually appealing with good colors and titles."""
 
+    return {"model": MODEL, "max_tokens": 2000,
+            "messages": [{"role": "user", "content": prompt}]}
+
+
+def _parse_nl_chart(text: str) -> dict:
+    """Extract the Plotly chart config JSON object from the LLM response."""
+    config = _extract_json(text, "{")
+    if isinstance(config, dict):
+        return config
+    return {"error": "Could not parse chart config"}
+
+
+def generate_nl_chart(query: str, cache: dict) -> dict:
+    """
+    Generate a Plotly chart configuration from a natural-language request.
+
+    Describes all available data columns (per-run and match columns) to
+    the LLM and asks it to produce a complete Plotly.js-compatible JSON
+    config ({data, layout, data_query}) that answers the user's question.
+    Returns an error dict when no API key is available, since there is no
+    meaningful regex-based fallback for arbitrary chart generation.
+    """
+    client = _get_client()
+    if client is None:
+        return {"error": "AI service not available. Set XAI_API_KEY environment variable."}
+
+    request = _nl_chart_request(query, cache)
     try:
-        response = client.chat.completions.create(
-            model=MODEL,
-            max_tokens=2000,
-            messages=[{"role": "user", "content": prompt}],
-        )
-        text = response.choices[0].message.content
-        start = text.find("{")
-        end = text.rfind("}") + 1
-        if start >= 0 and end > start:
-            return json.loads(text[start:end])
-        return {"error": "Could not parse chart config"}
+        response = client.chat.completions.create(**request)
+        return _parse_nl_chart(response.choices[0].message.content)
+    except Exception as e:
+        return {"error": str(e)}
+
+
+async def generate_nl_chart_async(query: str, cache: dict) -> dict:
+    """Async variant of generate_nl_chart()."""
+    client = _get_async_client()
+    if client is None:
+        return {"error": "AI service not available. Set XAI_API_KEY environment variable."}
+
+    request = _nl_chart_request(query, cache)
+    try:
+        response = await client.chat.completions.create(**request)
+        return _parse_nl_chart(response.choices[0].message.content)
     except Exception as e:
         return {"error": str(e)}
 
 
+# ── Streaming ────────────────────────────────────────────────────────────────
+# chat() and the executive report can take several seconds to complete, so
+# these variants stream the completion instead of blocking on it. Deltas are
+# buffered into ~50-token flushes so the HTTP layer is not woken for every
+# single token.
+
+_STREAM_FLUSH_CHARS = 200  # ~50 tokens per flush
+
+
+async def _stream_completion(client: "AsyncOpenAI", request: dict) -> AsyncIterator[str]:
+    """Yield the completion text in buffered chunks of ~_STREAM_FLUSH_CHARS."""
+    stream = await client.chat.completions.create(**request, stream=True)
+    buffer = []
+    size = 0
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content or ""
+        buffer.append(delta)
+        size += len(delta)
+        if size >= _STREAM_FLUSH_CHARS:
+            yield "".join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+async def chat_stream_async(message: str, history: list[dict], cache: dict) -> AsyncIterator[str]:
+    """Streaming variant of chat(); the fallback answer is yielded in one piece."""
+    client = _get_async_client()
+    if client is None:
+        yield _fallback_chat(message, cache)
+        return
+
+    request = _chat_request(message, history, cache)
+    try:
+        async for text in _stream_completion(client, request):
+            yield text
+    except Exception as e:
+        yield f"AI service error: {str(e)}"
+
+
+async def generate_executive_report_stream_async(cache: dict) -> AsyncIterator[str]:
+    """Streaming variant of generate_executive_report()."""
+    client = _get_async_client()
+    if client is None:
+        yield _fallback_report(cache)
+        return
+
+    request = _report_request(cache)
+    try:
+        async for text in _stream_completion(client, request):
+            yield text
+    except Exception as e:
+        yield f"Report generation error: {str(e)}"
+
+
+# ── Dashboard bundle ─────────────────────────────────────────────────────────
+# A dashboard render needs narratives, one insight set per chart and
+# optionally the report. Instead of N+2 round-trips these are packed into a
+# single prompt as id-keyed sections sharing one copy of the pipeline
+# context; the LLM answers with one JSON object keyed by section id and each
+# value is dispatched to the same merge / fallback paths as the single calls.
+
+def _bundle_request(cache: dict, charts: list[dict], include_report: bool,
+                    anomaly_data: list[dict]) -> dict:
+    """Build the create() kwargs for the combined dashboard call."""
+    context = _build_pipeline_context(cache)
+    concerns = _build_top_concerns_context(cache)
+    trajectories = _build_trajectory_context(cache)
+
+    sections = []
+    max_tokens = 0
+    if anomaly_data:
+        sections.append({
+            "id": "narratives",
+            "task": "For each anomaly write a 2-3 sentence narrative \"story card\" "
+                    "covering its history across inspections, why its current risk "
+                    "level is concerning, and what action should be considered. "
+                    "Value: JSON array of objects with \"joint\" and \"narrative\" keys.",
+            "anomalies": anomaly_data,
+        })
+        max_tokens += 4000
+    for i, chart in enumerate(charts):
+        sections.append({
+            "id": f"insights_{i}",
+            "task": "Identify the top 3-5 most important patterns in this chart "
+                    "(outliers, clusters, trends, danger zones, actionable findings). "
+                    "Value: JSON array of Plotly annotation objects with \"text\" "
+                    "(max 15 words), \"x\", \"y\" and \"showarrow\".",
+            "chart_type": chart.get("chart_type", ""),
+            "data": _to_json(chart.get("data", {}))[:3000],
+        })
+        max_tokens += 1500
+    if include_report:
+        sections.append({
+            "id": "report",
+            "task": "Write an executive summary report for management with markdown "
+                    "sections: Executive Summary, Inspection Overview, Alignment & "
+                    "Matching Results, Corrosion Growth Trends, Critical Findings "
+                    "(cite specific joints/locations), Recommended Actions, and Next "
+                    "Inspection Timing. Under 1500 words. Value: markdown string.",
+        })
+        max_tokens += 3000
+
+    prompt = f"""You are a senior pipeline integrity engineer preparing every AI panel of an ILI analysis dashboard at once.
+
+Pipeline data (shared by all sections):
+{context}
+
+{concerns}
+
+{trajectories}
+
+Sections:
+{_to_json(sections)}
+
+Return a single JSON object with one key per section id, whose value follows that section's "task". Only return the JSON object, nothing else."""
+
+    return {"model": MODEL, "max_tokens": max_tokens,
+            "messages": [{"role": "user", "content": prompt}]}
+
+
+def _bundle_fallback(cache: dict, charts: list[dict], include_report: bool,
+                     anomaly_data: list[dict], report_error: Optional[str] = None) -> dict:
+    """Assemble the bundle from the per-section fallback responses."""
+    if report_error is not None:
+        report = f"Report generation error: {report_error}"
+    else:
+        report = _fallback_report(cache)
+    return {
+        "narratives": _fallback_narratives(anomaly_data),
+        "insights": [_fallback_insights(c.get("chart_type", ""), c.get("data", {}), cache)
+                     for c in charts],
+        "report": report if include_report else None,
+    }
+
+
+def _split_bundle(text: str, charts: list[dict], include_report: bool,
+                  anomaly_data: list[dict]) -> dict:
+    """Parse the combined JSON object and dispatch each section by id."""
+    sections = _extract_json(text, "{")
+    if not isinstance(sections, dict):
+        sections = {}
+
+    narratives = sections.get("narratives")
+    if not isinstance(narratives, list):
+        narratives = [{"joint": d["joint"], "narrative": "Narrative generation failed."} for d in anomaly_data]
+    insights = []
+    for i in range(len(charts)):
+        annotations = sections.get(f"insights_{i}")
+        insights.append(annotations if isinstance(annotations, list) else [])
+    return {
+        "narratives": _apply_narratives(narratives, anomaly_data),
+        "insights": insights,
+        "report": str(sections.get("report", "")) if include_report else None,
+    }
+
+
+def generate_dashboard_bundle(cache: dict, charts: list[dict],
+                              include_report: bool = False, n: int = 20) -> dict:
+    """
+    Generate narratives, per-chart insights and (optionally) the report in one LLM call.
+
+    `charts` is a list of {chart_type, data} dicts. Returns a dict with
+    "narratives" (as generate_anomaly_narratives), "insights" (one
+    annotation list per chart, in order) and "report" (markdown, or None
+    when not requested). Falls back to the template responses when no API
+    key is configured or the combined call fails.
+    """
+    client = _get_client()
+    anomaly_data = _collect_narrative_anomalies(cache, n)
+    if client is None:
+        return _bundle_fallback(cache, charts, include_report, anomaly_data)
+
+    request = _bundle_request(cache, charts, include_report, anomaly_data)
+    try:
+        response = client.chat.completions.create(**request)
+        return _split_bundle(response.choices[0].message.content, charts,
+                             include_report, anomaly_data)
+    except Exception as e:
+        return _bundle_fallback(cache, charts, include_report, anomaly_data, str(e))
+
+
+async def generate_dashboard_bundle_async(cache: dict, charts: list[dict],
+                                          include_report: bool = False, n: int = 20) -> dict:
+    """Async variant of generate_dashboard_bundle()."""
+    client = _get_async_client()
+    anomaly_data = _collect_narrative_anomalies(cache, n)
+    if client is None:
+        return _bundle_fallback(cache, charts, include_report, anomaly_data)
+
+    request = _bundle_request(cache, charts, include_report, anomaly_data)
+    try:
+        response = await client.chat.completions.create(**request)
+        return _split_bundle(response.choices[0].message.content, charts,
+                             include_report, anomaly_data)
+    except Exception as e:
+        return _bundle_fallback(cache, charts, include_report, anomaly_data, str(e))
+
+
 # == Fallback responses (when no API key) =====================================
 # These functions provide useful data-driven answers without calling an LLM.
 # They are used both as the primary response path when no API key is set
 # and as error recovery when LLM calls fail.
 
+# Keyword routes for _fallback_chat in priority order: when a message hits
+# several routes, the earliest route in this list wins.
+_FALLBACK_ROUTES = [
+    ("summary", ["summary", "overview", "tell me about"]),
+    ("risk", ["risk", "concern", "dangerous", "critical", "worst"]),
+    ("growth", ["growth", "trajectory", "trend", "predict"]),
+    ("match", ["match", "align", "pair"]),
+]
+
+if HAS_AHOCORASICK:
+    # One automaton over every keyword; payload is (priority, route)
+    _ROUTE_AUTOMATON = ahocorasick.Automaton()
+    for _priority, (_route, _words) in enumerate(_FALLBACK_ROUTES):
+        for _word in _words:
+            _ROUTE_AUTOMATON.add_word(_word, (_priority, _route))
+    _ROUTE_AUTOMATON.make_automaton()
+else:
+    _ROUTE_PATTERNS = [(route, re.compile("|".join(map(re.escape, words))))
+                       for route, words in _FALLBACK_ROUTES]
+# Requested count for the risk route: "top 5", "show me 10" ... or "5 worst"
+_TOP_N_LEADING_RE = re.compile(r"(?:top|show|list|give)\s*(?:me\s*)?(\d+)")
+_TOP_N_TRAILING_RE = re.compile(r"(\d+)\s*(?:top|worst|biggest|highest|critical|risk|concern)")
+
+
+def _route_message(msg_lower: str) -> Optional[str]:
+    """Return the highest-priority route whose keyword occurs in the message."""
+    if HAS_AHOCORASICK:
+        # Single pass over the message collecting every keyword hit
+        hits = [payload for _, payload in _ROUTE_AUTOMATON.iter(msg_lower)]
+        return min(hits)[1] if hits else None
+    return next((route for route, pattern in _ROUTE_PATTERNS if pattern.search(msg_lower)), None)
+
+
 def _fallback_chat(message: str, cache: dict) -> str:
     """
     Provide data-driven responses without LLM using regex-based routing.
@@ -570,40 +1184,34 @@ def _fallback_chat(message: str, cache: dict) -> str:
     msg_lower = message.lower()
     results = cache.get("results", {})
     pairwise = results.get("pairwise", {})
-    chain = results.get("chain", {})
+    route = _route_message(msg_lower)
 
     # Route: summary keywords
-    if any(w in msg_lower for w in ["summary", "overview", "tell me about"]):
+    if route == "summary":
         return _build_pipeline_context(cache)
 
-
     # Route: risk keywords -- also parses a requested count from the message
-    if any(w in msg_lower for w in ["risk", "concern", "dangerous", "critical", "worst"]):
+    if route == "risk":
         # Parse requested count: "top 5 risks", "show me 10 worst", etc.
         n = 20  # default
-        m = re.search(r'(?:top|show|list|give)\s*(?:me\s*)?(\d+)', msg_lower)
-        if not m:
-            m = re.search(r'(\d+)\s*(?:top|worst|biggest|highest|critical|risk|concern)', msg_lower)
+        m = _TOP_N_LEADING_RE.search(msg_lower) or _TOP_N_TRAILING_RE.search(msg_lower)
         if m:
             n = max(1, min(100, int(m.group(1))))
         return _build_top_concerns_context(cache, n=n)
 
     # Route: growth / trajectory keywords
-
-    if any(w in msg_lower for w in ["growth", "trajectory", "trend", "predict"]):
+    if route == "growth":
         return _build_trajectory_context(cache) or "No multi-run trajectory data available."
 
     # Route: match / alignment keywords
-
-    if any(w in msg_lower for w in ["match", "align", "pair"]):
+    if route == "match":
         parts = []
         for (ye, yl), mr in pairwise.items():
-            matches = mr.get("matches", pd.DataFrame())
+            matches = mr.get("matches", _EMPTY_DF)
             parts.append(f"{ye}-{yl}: {len(matches)} matches found")
-
-    # Default: show help menu with available query topics
         return "\n".join(parts) if parts else "No matching data available."
 
+    # Default: show help menu with available query topics
     return (
         "I can answer questions about this pipeline's inspection data. "
         "Try asking about:\n"
@@ -638,20 +1246,22 @@ def _fallback_narratives(anomaly_data: list[dict]) -> list[dict]:
         remaining = d.get("remaining_life_years")
         risk = d.get("risk_category", "Unknown")
 
-        narrative = f"This {d.get('event_type', 'anomaly')} at joint {d.get('joint', '?')} "
-        narrative += f"has a current depth of {depth}% wall loss "
+        pieces = [
+            f"This {d.get('event_type', 'anomaly')} at joint {d.get('joint', '?')} "
+            f"has a current depth of {depth}% wall loss "
+        ]
         if growth is not None:
-            narrative += f"and is growing at {growth:.2f}%/yr. "
+            pieces.append(f"and is growing at {growth:.2f}%/yr. ")
         if remaining is not None and remaining < 20:
-            narrative += f"Estimated remaining life is {remaining:.0f} years. "
-        narrative += f"Risk classification: {risk}."
+            pieces.append(f"Estimated remaining life is {remaining:.0f} years. ")
+        pieces.append(f"Risk classification: {risk}.")
 
         if d.get("depth_2007") is not None:
-            narrative += f" Tracked since 2007 ({d['depth_2007']}% -> {d.get('depth_2015', '?')}% -> {depth}%)."
+            pieces.append(f" Tracked since 2007 ({d['depth_2007']}% -> {d.get('depth_2015', '?')}% -> {depth}%).")
         if d.get("is_accelerating"):
-            narrative += " Growth appears to be ACCELERATING."
+            pieces.append(" Growth appears to be ACCELERATING.")
 
-        d["narrative"] = narrative
+        d["narrative"] = "".join(pieces)
     return anomaly_data
 
 
@@ -664,6 +1274,21 @@ def _fallback_insights(chart_type: str, data: dict, cache: dict) -> list[dict]:
     ]
 
 
+def _safe_column(s: pd.Series) -> list:
+    """
+    Column-wise _safe_val: return the Series as a list of native Python values.
+
+    Float columns are rounded to 2 decimals with NaN -> None in one pass;
+    integer and bool columns convert directly; any other dtype falls back
+    to _safe_val per element.
+    """
+    if pd.api.types.is_bool_dtype(s) or pd.api.types.is_integer_dtype(s):
+        return s.tolist()
+    if pd.api.types.is_float_dtype(s):
+        return s.round(2).astype(object).where(s.notna(), None).tolist()
+    return [_safe_val(v) for v in s.tolist()]
+
+
 def _safe_val(v):
     """
     Convert numpy scalar types to native Python types for JSON serialization.
@@ -12,61 +12,112 @@ the same distance axis, anomalies at the same physical location can be compared
 across inspections.
 """
 
+from functools import reduce
+from typing import Callable
+
 import numpy as np
 import pandas as pd
-from scipy.interpolate import interp1d
 
 from data_ingestion import get_girth_welds
 
+from _numba_support import load_kernels
+
+_interp_numba = load_kernels("_interp_numba")
+HAS_NUMBA = _interp_numba is not None
+
 
-def match_girth_welds(runs: dict[int, pd.DataFrame]) -> pd.DataFrame:
+def match_girth_welds(
+    runs: dict[int, pd.DataFrame],
+    return_stats: bool = False,
+) -> pd.DataFrame | tuple[pd.DataFrame, dict]:
     """Match girth welds across runs by joint number.
 
     Returns a DataFrame with columns: joint_number, dist_{year} for each run,
-    plus delta columns between adjacent runs.
+    plus delta columns between adjacent runs. With `return_stats=True`, returns
+    (alignment, compute_alignment_stats(alignment)), with the drift stats taken
+    from the delta arrays while they are still at hand.
     """
     # Collect each run's girth-weld table keyed by joint number.
     # After dedup + intersection we expect ~1,603 joints common to all 3 runs.
     gw_by_year = {}
     for year, df in runs.items():
-        gw = get_girth_welds(df)
-        # Take first occurrence per joint (avoid duplicates)
-        gw_dedup = gw.drop_duplicates(subset="joint_number", keep="first")
-        gw_by_year[year] = gw_dedup.set_index("joint_number")["log_distance_ft"]
-
-    # Find common joint numbers across all runs.
-    # Only joints present in every run can serve as alignment anchors.
-    joint_sets = [set(s.index) for s in gw_by_year.values()]
-    common_joints = sorted(set.intersection(*joint_sets))
-
-    # Build one row per common joint containing each run's distance reading.
-    records = []
-    for jn in common_joints:
-        record = {"joint_number": jn}
-        for year in sorted(gw_by_year.keys()):
-            record[f"dist_{year}"] = gw_by_year[year].loc[jn]
-        records.append(record)
-
-    result = pd.DataFrame(records)
-
-    # Compute deltas between consecutive runs.
-    # Positive delta means the later run's odometer read a larger value at the
-    # same physical location -- i.e., it drifted ahead.
+        gw = get_girth_welds(df, sort=False)
+        # One distance per joint (avoid duplicates): the first occurrence in
+        # pipeline order, i.e. the smallest distance, in a single hashed pass
+        gw_by_year[year] = gw.groupby("joint_number", sort=False)["log_distance_ft"].min()
+
+    # Find common joint numbers across all runs: only joints present in every
+    # run can serve as alignment anchors. Intersecting the (unique, post-dedup)
+    # joint arrays smallest-first shrinks the working set fastest, and
+    # np.intersect1d returns them already sorted.
     years = sorted(gw_by_year.keys())
-    for i in range(1, len(years)):
-        y_prev, y_curr = years[i - 1], years[i]
-        result[f"delta_{y_prev}_{y_curr}"] = (
-            result[f"dist_{y_curr}"] - result[f"dist_{y_prev}"]
-        )
+    joint_arrays = sorted((s.index.to_numpy() for s in gw_by_year.values()), key=len)
+    common_joints = reduce(
+        lambda left, right: np.intersect1d(left, right, assume_unique=True),
+        joint_arrays[1:],
+        np.sort(joint_arrays[0]),
+    )
+
+    # One row per common joint containing each run's distance reading; the
+    # readings are stacked as a (joints x years) matrix so all adjacent-run
+    # deltas come out of a single np.diff
+    dists = np.column_stack([gw_by_year[year].loc[common_joints].to_numpy() for year in years])
+    deltas = np.diff(dists, axis=1)
+    columns = {"joint_number": common_joints}
+    for j, year in enumerate(years):
+        columns[f"dist_{year}"] = dists[:, j]
 
+    # Deltas between consecutive runs.
+    # Positive delta means the later run's odometer read a larger value at the
+    # same physical location -- i.e., it drifted ahead.
+    drift = {}
+    for i, (y_prev, y_curr) in enumerate(zip(years, years[1:])):
+        columns[f"delta_{y_prev}_{y_curr}"] = deltas[:, i]
+        if return_stats:
+            drift[f"drift_{y_prev}_{y_curr}"] = _drift_stats(deltas[:, i])
+    result = pd.DataFrame(columns)
+
+    if return_stats:
+        return result, {**_joint_stats(result), **drift}
     return result
 
 
+def piecewise_linear(x: np.ndarray, xp: np.ndarray, fp: np.ndarray) -> np.ndarray:
+    """Piecewise linear interpolation through (xp, fp), extrapolating linearly.
+
+    np.interp does the in-range lookup in C; it clamps outside [xp[0], xp[-1]],
+    so those points are extended along the first / last segment instead
+    (same result as interp1d(..., fill_value="extrapolate")). xp must be
+    increasing. NaN inputs give NaN.
+
+    Runs the parallel numba kernel instead when numba is available.
+    """
+    if HAS_NUMBA and len(xp) >= 2:
+        x = np.ascontiguousarray(x, dtype=np.float64)
+        out = np.empty_like(x)
+        _interp_numba.piecewise_linear_kernel(
+            x, np.ascontiguousarray(xp, dtype=np.float64),
+            np.ascontiguousarray(fp, dtype=np.float64), out,
+        )
+        return out
+    out = np.interp(x, xp, fp)
+    if len(xp) >= 2:
+        # Only the few rows past the end welds need fixing up; write them by
+        # index (NaN compares False, so missing distances stay NaN)
+        below = np.flatnonzero(x < xp[0])
+        if below.size:
+            out[below] = fp[0] + (fp[1] - fp[0]) / (xp[1] - xp[0]) * (x[below] - xp[0])
+        above = np.flatnonzero(x > xp[-1])
+        if above.size:
+            out[above] = fp[-1] + (fp[-1] - fp[-2]) / (xp[-1] - xp[-2]) * (x[above] - xp[-1])
+    return out
+
+
 def build_distance_corrector(
     gw_alignment: pd.DataFrame,
     source_year: int,
     reference_year: int = 2022,
-) -> interp1d:
+) -> Callable[[np.ndarray], np.ndarray]:
     """Build piecewise linear interpolation function to correct distances.
 
     Maps distances from source_year's coordinate frame to reference_year's frame.
@@ -75,21 +126,12 @@ def build_distance_corrector(
     ref_col = f"dist_{reference_year}"
 
     # The matched girth-weld distances form (source, reference) coordinate
-    # pairs.  scipy's interp1d connects them with line segments so any
-    # distance between two welds is linearly interpolated.
-    src_dists = gw_alignment[src_col].values
-    ref_dists = gw_alignment[ref_col].values
-
-    # interp1d with fill_value="extrapolate" for anomalies outside girth weld range.
-    # Extrapolation handles anomalies that fall before the first or after
-    # the last matched girth weld in the pipeline.
-    corrector = interp1d(
-        src_dists, ref_dists,
-        kind="linear",
-        fill_value="extrapolate",
-        assume_sorted=True,
-    )
-    return corrector
+    # pairs, connected with line segments so any distance between two welds
+    # is linearly interpolated. Anomalies that fall before the first or after
+    # the last matched girth weld are extrapolated along the end segments.
+    src_dists = gw_alignment[src_col].to_numpy(dtype=float)
+    ref_dists = gw_alignment[ref_col].to_numpy(dtype=float)
+    return lambda x: piecewise_linear(np.asarray(x, dtype=float), src_dists, ref_dists)
 
 
 def apply_distance_correction(
@@ -107,19 +149,18 @@ def apply_distance_correction(
     # anomaly positions.
     corrected_runs = {}
     for year, df in runs.items():
-        df = df.copy()
         if year == reference_year:
             # Reference year (2022) is the target frame -- no mapping needed.
-            df["corrected_distance"] = df["log_distance_ft"]
+            corrected = df["log_distance_ft"]
         else:
             # For 2007 and 2015, build a corrector from their girth-weld
-            # distances to the 2022 distances and apply it to every anomaly.
+            # distances to the 2022 distances and apply it to every row in
+            # one pass (missing distances stay NaN).
             corrector = build_distance_corrector(gw_alignment, year, reference_year)
-            valid = df["log_distance_ft"].notna()
-            df.loc[valid, "corrected_distance"] = corrector(
-                df.loc[valid, "log_distance_ft"].values
-            )
-            df.loc[~valid, "corrected_distance"] = np.nan
+            corrected = corrector(df["log_distance_ft"].to_numpy(dtype=float))
+        # assign() is a shallow copy under copy-on-write, so the existing
+        # columns are shared with the input run rather than duplicated
+        df = df.assign(corrected_distance=corrected)
         corrected_runs[year] = df
 
     return corrected_runs
@@ -134,22 +175,45 @@ def compute_alignment_stats(gw_alignment: pd.DataFrame) -> dict:
     drifted and whether the correction is well-behaved.
     """
     years = sorted([int(c.split("_")[1]) for c in gw_alignment.columns if c.startswith("dist_")])
-    stats = {
-        "common_joints": len(gw_alignment),
-        "joint_range": (int(gw_alignment["joint_number"].min()),
-                        int(gw_alignment["joint_number"].max())),
-    }
+    stats = _joint_stats(gw_alignment)
     # For each pair of adjacent runs, summarise the per-joint distance drift.
     for i in range(1, len(years)):
         y_prev, y_curr = years[i - 1], years[i]
         delta_col = f"delta_{y_prev}_{y_curr}"
         if delta_col in gw_alignment.columns:
-            deltas = gw_alignment[delta_col]
-            stats[f"drift_{y_prev}_{y_curr}"] = {
-                "mean": round(deltas.mean(), 3),
-                "std": round(deltas.std(), 3),
-                "min": round(deltas.min(), 3),
-                "max": round(deltas.max(), 3),
-                "abs_mean": round(deltas.abs().mean(), 3),
-            }
+            stats[f"drift_{y_prev}_{y_curr}"] = _drift_stats(
+                gw_alignment[delta_col].to_numpy(dtype=float)
+            )
     return stats
+
+
+def _joint_stats(gw_alignment: pd.DataFrame) -> dict:
+    """Count and joint-number range of the matched girth welds."""
+    joints = gw_alignment["joint_number"]
+    return {
+        "common_joints": len(gw_alignment),
+        "joint_range": (int(joints.min()), int(joints.max())),
+    }
+
+
+def _drift_stats(deltas: np.ndarray) -> dict:
+    """Mean / std / min / max / mean-absolute drift of one delta array.
+
+    Works on the raw float array (NaN skipped, sample std like pandas) so the
+    five stats don't each go through a Series reduction.
+    """
+    d = deltas[~np.isnan(deltas)]
+    n = len(d)
+    if n == 0:
+        return {key: np.nan for key in ("mean", "std", "min", "max", "abs_mean")}
+    mean = d.sum() / n
+    sq = d - mean
+    np.square(sq, out=sq)
+    std = np.sqrt(sq.sum() / (n - 1)) if n > 1 else np.nan
+    return {
+        "mean": round(mean, 3),
+        "std": round(std, 3),
+        "min": round(d.min(), 3),
+        "max": round(d.max(), 3),
+        "abs_mean": round(np.fabs(d, out=sq).sum() / n, 3),
+    }
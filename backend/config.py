@@ -113,6 +113,13 @@ COLUMN_MAP = {
     },
 }
 
+# Measurement columns coerced to numbers after renaming (invalid -> NaN)
+NUMERIC_COLS = (
+    "depth_pct", "length_in", "width_in", "log_distance_ft",
+    "joint_number", "joint_length_ft", "wall_thickness_in",
+    "dist_to_us_weld_ft", "elevation_ft",
+)
+
 # ── Event type normalization ──────────────────────────────────────────────────
 # The three vendor reports contain 59+ distinct raw event-type strings.
 # EVENT_TYPE_MAP collapses them into 28 canonical types so that the matcher
@@ -187,16 +194,21 @@ EVENT_TYPE_MAP = {
 # Feature types classified as corrosion or defect anomalies.
 # Only these types participate in cross-run matching and growth analysis;
 # structural features (bends, valves, etc.) are excluded.
-ANOMALY_TYPES = {
+ANOMALY_TYPES = frozenset({
     "Metal Loss", "Cluster", "Metal Loss Manufacturing",
     "Dent", "Seam Weld Manufacturing", "Seam Weld Anomaly",
     "Seam Weld Dent", "Girth Weld Anomaly",
-}
+})
 
 # Girth welds serve as fixed reference points for joint-level alignment.
 # Because every ILI tool reliably detects girth welds, they anchor the
 # coordinate system so that anomaly positions can be compared across runs.
-REFERENCE_TYPES = {"Girth Weld"}
+REFERENCE_TYPES = frozenset({"Girth Weld"})
+
+# Canonical event-type categories shared by every run, so all three runs get
+# the same categorical codes (vendor labels missing from EVENT_TYPE_MAP are
+# appended per run).
+EVENT_TYPE_CATEGORIES = sorted(set(EVENT_TYPE_MAP.values()) | ANOMALY_TYPES | REFERENCE_TYPES)
 
 # Cross-run type compatibility for anomaly matching.
 # Some types are interchangeable because vendors report them differently:
@@ -225,6 +237,9 @@ ID_OD_MAP_2007 = {
     "N/A": "Unknown",
 }
 
+# Canonical ID/OD categories after normalization (all vendors)
+ID_OD_CATEGORIES = ["External", "Internal", "Unknown"]
+
 # ── Matching tolerances ───────────────────────────────────────────────────────
 # Maximum allowable differences when deciding whether two features from
 # different ILI runs could be the same physical anomaly.
@@ -9,42 +9,87 @@ Each vendor sheet is normalized to a unified schema so downstream alignment
 and analytics modules can operate on a single consistent DataFrame structure.
 """
 
+import contextlib
 import datetime
 import pandas as pd
 import numpy as np
 from config import (
     COLUMN_MAP, EVENT_TYPE_MAP, ANOMALY_TYPES, REFERENCE_TYPES,
-    ID_OD_MAP_2007, RUN_YEARS,
+    EVENT_TYPE_CATEGORIES, ID_OD_MAP_2007, ID_OD_CATEGORIES, NUMERIC_COLS, RUN_YEARS,
 )
 
+try:
+    import python_calamine  # noqa: F401 -- enables pandas' Rust-backed "calamine" engine
+    HAS_CALAMINE = True
+except ImportError:
+    HAS_CALAMINE = False
 
-def load_all_runs(filepath: str) -> dict[int, pd.DataFrame]:
+# calamine parses the workbook without building openpyxl's per-cell object
+# graph (several times faster on the ILI workbook, identical frames)
+EXCEL_ENGINE = "calamine" if HAS_CALAMINE else "openpyxl"
+
+
+def open_workbook(filepath: str) -> pd.ExcelFile:
+    """Open the ILI workbook once so the run sheets and Summary share one handle.
+
+    The returned ExcelFile is a context manager; close it when done.
+    """
+    return pd.ExcelFile(filepath, engine=EXCEL_ENGINE)
+
+
+@contextlib.contextmanager
+def _workbook(source: str | pd.ExcelFile):
+    """Yield an open workbook for `source`, closing it only if opened here."""
+    if isinstance(source, pd.ExcelFile):
+        yield source
+    else:
+        with open_workbook(source) as xls:
+            yield xls
+
+
+def load_all_runs(filepath: str | pd.ExcelFile) -> dict[int, pd.DataFrame]:
     """Load and normalize all ILI run sheets from the Excel file.
 
     Iterates over configured RUN_YEARS, reads each matching sheet by name
     (e.g. "2007", "2015", "2022"), and normalizes each to the unified schema.
     Returns a dict keyed by run year so callers can process runs independently
-    or compare across years.
+    or compare across years. Accepts a path or an already-open workbook.
     """
-    xls = pd.ExcelFile(filepath, engine="openpyxl")
+    # Sheets are read sequentially on purpose: neither engine parallelizes
+    # across threads (calamine's value conversion and openpyxl hold the GIL),
+    # so a thread pool measured no faster on the bundled workbook, and sharing
+    # one open handle avoids re-parsing the archive per sheet.
     runs = {}
-    for year in RUN_YEARS:
-        sheet = str(year)
-        if sheet in xls.sheet_names:
-            df = pd.read_excel(xls, sheet_name=sheet)
-            df = _normalize(df, year)
-            runs[year] = df
+    with _workbook(filepath) as xls:
+        for year in RUN_YEARS:
+            sheet = str(year)
+            if sheet in xls.sheet_names:
+                df = pd.read_excel(xls, sheet_name=sheet)
+                df = _normalize(df, year)
+                runs[year] = df
     return runs
 
 
-def load_summary(filepath: str) -> pd.DataFrame:
+def load_summary(filepath: str | pd.ExcelFile) -> pd.DataFrame:
     """Load the Summary sheet with run metadata.
 
     The Summary sheet contains one row per ILI run with metadata such as
     vendor name, tool type, inspection dates, pipeline segment info, and
     run direction. Used to populate header cards in the Data Overview dashboard.
+    Accepts a path or an already-open workbook.
     """
-    return pd.read_excel(filepath, sheet_name="Summary", engine="openpyxl")
+    with _workbook(filepath) as xls:
+        return pd.read_excel(xls, sheet_name="Summary")
+
+
+def load_workbook(filepath: str | pd.ExcelFile) -> tuple[dict[int, pd.DataFrame], pd.DataFrame]:
+    """Load all run sheets and the Summary sheet from one workbook parse.
+
+    Equivalent to (load_all_runs(filepath), load_summary(filepath)) but opens
+    the file once, so the pipeline doesn't pay the xlsx archive parse twice.
+    """
+    with _workbook(filepath) as xls:
+        return load_all_runs(xls), load_summary(xls)
 
 
 def _normalize(df: pd.DataFrame, year: int) -> pd.DataFrame:
@@ -65,34 +110,41 @@ def _normalize(df: pd.DataFrame, year: int) -> pd.DataFrame:
 
     # Normalize event types - collapse vendor-specific labels to a shared vocabulary
     if "event_type" in df.columns:
-        df["event_type"] = df["event_type"].map(
-            lambda x: EVENT_TYPE_MAP.get(str(x).strip(), str(x).strip())
-            if pd.notna(x) else x
-        )
-
-    # Boolean flags - pre-compute so downstream filters don't repeat set lookups
-    df["is_anomaly"] = df["event_type"].isin(ANOMALY_TYPES)
-    df["is_girth_weld"] = df["event_type"].isin(REFERENCE_TYPES)
+        raw = df["event_type"]
+        stripped = raw.astype(str).str.strip().where(raw.notna())
+        df["event_type"] = _to_category(stripped.map(_EVENT_TYPE_LOOKUP).fillna(stripped), EVENT_TYPE_CATEGORIES)
+
+    # Boolean flags - pre-compute so downstream filters don't repeat set lookups;
+    # membership is tested on the integer category codes, not the strings
+    event_type = df["event_type"]
+    if isinstance(event_type.dtype, pd.CategoricalDtype):
+        codes = event_type.cat.codes.to_numpy()
+        df["is_anomaly"] = np.isin(codes, _ANOMALY_CODES)
+        df["is_girth_weld"] = np.isin(codes, _REFERENCE_CODES)
+    else:
+        df["is_anomaly"] = event_type.isin(ANOMALY_TYPES)
+        df["is_girth_weld"] = event_type.isin(REFERENCE_TYPES)
 
     # Normalize clock position (pandas reads as datetime.time -> decimal hours 0-12)
     if "clock_position" in df.columns:
-        df["clock_hours"] = df["clock_position"].apply(_clock_to_hours)
+        df["clock_hours"] = _clock_to_hours_vec(df["clock_position"])
 
     # Normalize ID/OD - Rosen 2007 uses numeric codes; later vendors use strings
     if year == 2007 and "id_od" in df.columns:
-        df["id_od"] = df["id_od"].map(
-            lambda x: ID_OD_MAP_2007.get(str(x).strip(), "Unknown")
-            if pd.notna(x) else "Unknown"
+        raw = df["id_od"]
+        df["id_od"] = (
+            raw.astype(str).str.strip().where(raw.notna())
+            .map(_ID_OD_LOOKUP_2007).fillna("Unknown")
         )
     elif "id_od" in df.columns:
         df["id_od"] = df["id_od"].fillna("Unknown").astype(str).str.strip()
+    if "id_od" in df.columns:
+        df["id_od"] = _to_category(df["id_od"], ID_OD_CATEGORIES)
 
     # Ensure numeric columns - coerce non-numeric entries to NaN rather than failing
-    for col in ["depth_pct", "length_in", "width_in", "log_distance_ft",
-                 "joint_number", "joint_length_ft", "wall_thickness_in",
-                 "dist_to_us_weld_ft", "elevation_ft"]:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce")
+    present = [col for col in NUMERIC_COLS if col in df.columns]
+    if present:
+        df[present] = df[present].apply(pd.to_numeric, errors="coerce")
 
     # Add run year so merged/concatenated DataFrames remain distinguishable
     df["run_year"] = year
@@ -135,34 +187,134 @@ def _clock_to_hours(val) -> float:
     return np.nan
 
 
-def get_anomalies(df: pd.DataFrame) -> pd.DataFrame:
+# Category codes of the anomaly / reference types. Every run's event_type
+# dtype starts with EVENT_TYPE_CATEGORIES (extras are only appended), and
+# both type sets are canonical, so these codes hold for all runs.
+_ANOMALY_CODES = np.array(
+    [i for i, t in enumerate(EVENT_TYPE_CATEGORIES) if t in ANOMALY_TYPES], dtype=np.int8
+)
+_REFERENCE_CODES = np.array(
+    [i for i, t in enumerate(EVENT_TYPE_CATEGORIES) if t in REFERENCE_TYPES], dtype=np.int8
+)
+
+# Label lookups as Series (unique string index) so .map goes through a
+# pandas hashtable indexer instead of calling back into a Python dict
+_EVENT_TYPE_LOOKUP = pd.Series(EVENT_TYPE_MAP)
+_ID_OD_LOOKUP_2007 = pd.Series(ID_OD_MAP_2007)
+
+
+def _to_category(s: pd.Series, categories: list[str]) -> pd.Series:
+    """Cast a label column to a categorical over the shared `categories`.
+
+    Labels outside the shared list are appended (sorted) rather than lost,
+    so only runs with unexpected vendor labels get extra categories.
+    """
+    known = set(categories)
+    extras = sorted(v for v in s.dropna().unique() if v not in known)
+    return s.astype(pd.CategoricalDtype(list(categories) + extras))
+
+
+# Element-wise type tests used by _clock_to_hours_vec (same checks as _clock_to_hours)
+_is_time = np.frompyfunc(lambda x: isinstance(x, datetime.time), 1, 1)
+_is_number = np.frompyfunc(lambda x: isinstance(x, (int, float)), 1, 1)
+_is_str = np.frompyfunc(lambda x: isinstance(x, str), 1, 1)
+
+
+def _clock_to_hours_vec(s: pd.Series) -> np.ndarray:
+    """Vectorized _clock_to_hours over a whole clock-position column.
+
+    Each vendor sheet is consistent within itself, so the column's value type
+    is inferred once and dispatched to a typed conversion: numeric columns in
+    a single array expression, all-time columns (the usual case) in one pass
+    over the non-null cells, text columns through the scalar parser. Only
+    genuinely mixed object columns are split by type element-wise.
+    """
+    if pd.api.types.is_numeric_dtype(s):
+        return (s.to_numpy(dtype=float) * 24.0) % 12.0
+
+    arr = s.to_numpy(dtype=object)
+    out = np.full(len(arr), np.nan)
+    valid = ~pd.isna(arr)
+    kind = pd.api.types.infer_dtype(arr, skipna=True)
+    if kind == "time":
+        out[valid] = _time_to_hours(arr[valid])
+        return out
+    if kind == "string":
+        out[valid] = [_clock_to_hours(v) for v in arr[valid]]
+        return out
+
+    is_time = valid & _is_time(arr).astype(bool)
+    is_num = valid & _is_number(arr).astype(bool)
+    is_str = valid & _is_str(arr).astype(bool)
+
+    if is_num.any():
+        out[is_num] = (arr[is_num].astype(float) * 24.0) % 12.0
+    if is_time.any():
+        out[is_time] = _time_to_hours(arr[is_time])
+    if is_str.any():
+        out[is_str] = [_clock_to_hours(v) for v in arr[is_str]]
+    return out
+
+
+def _time_to_hours(times: np.ndarray) -> np.ndarray:
+    """Decimal hours (0-12) for an object array of datetime.time; 00:00 -> NaN."""
+    total_hours = np.fromiter(
+        (t.hour + t.minute / 60.0 + t.second / 3600.0 for t in times),
+        dtype=np.float64, count=len(times),
+    )
+    return np.where(total_hours > 0, total_hours % 12.0, np.nan)
+
+
+def get_anomalies(df: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
     """Extract anomaly rows with valid depth.
 
     Filters to rows where: the event type is a recognized anomaly (metal loss,
     dent, crack, etc.), AND both depth_pct and log_distance_ft are non-null.
     Rows missing depth or distance are excluded because they cannot be plotted
     on the depth-vs-distance chart or used in growth calculations.
+
+    Pass copy=False from read-only callers (counts, aggregates) to skip the
+    defensive copy of the filtered rows.
     """
     mask = df["is_anomaly"] & df["depth_pct"].notna() & df["log_distance_ft"].notna()
-    return df[mask].copy()
+    anomalies = df[mask]
+    return anomalies.copy() if copy else anomalies
 
 
-def get_girth_welds(df: pd.DataFrame) -> pd.DataFrame:
+def get_girth_welds(df: pd.DataFrame, sort: bool = True) -> pd.DataFrame:
     """Extract girth weld rows with valid joint number and distance.
 
     Girth welds serve as the fixed reference points for cross-run alignment:
     each weld has a joint number and a log distance, and matching joint numbers
     across runs allows the alignment module to compute distance offsets. Rows
     missing joint_number or log_distance_ft are excluded, and results are sorted
-    by distance so the alignment algorithm can iterate welds in pipeline order.
+    by distance so the alignment algorithm can iterate welds in pipeline order
+    (sort=False skips that for callers that only need joint membership).
     """
     mask = df["is_girth_weld"] & df["joint_number"].notna() & df["log_distance_ft"].notna()
-    gw = df[mask].copy()
-    gw["joint_number"] = gw["joint_number"].astype(int)
-    return gw.sort_values("log_distance_ft")
+    # astype and sort_values both return new frames, so no extra copy is needed
+    gw = df[mask].astype({"joint_number": int})
+    return gw.sort_values("log_distance_ft") if sort else gw
+
 
+def summarize_run(df: pd.DataFrame) -> dict:
+    """Row, anomaly and girth-weld counts for one run.
 
-def data_quality_report(runs: dict[int, pd.DataFrame]) -> pd.DataFrame:
+    Computed once when a run is loaded into the cache so the AI context
+    builders can read scalars instead of re-reducing the flag columns on
+    every chat turn. Counts are raw flag sums (no depth/distance filtering).
+    """
+    return {
+        "rows": len(df),
+        "anom": int(df["is_anomaly"].sum()) if "is_anomaly" in df.columns else 0,
+        "gw": int(df["is_girth_weld"].sum()) if "is_girth_weld" in df.columns else 0,
+    }
+
+
+def data_quality_report(
+    runs: dict[int, pd.DataFrame],
+    anomalies_by_year: dict[int, pd.DataFrame] | None = None,
+) -> pd.DataFrame:
     """Generate a data quality summary for each run.
 
     Produces one row per run year with aggregate metrics: total row count,
@@ -170,46 +322,65 @@ def data_quality_report(runs: dict[int, pd.DataFrame]) -> pd.DataFrame:
     columns (depth, length, width, clock), and the distance/joint ranges.
     This feeds the Data Overview dashboard so operators can quickly spot
     incomplete or suspect runs before proceeding to alignment.
+
+    `anomalies_by_year` lets a caller that also builds column_completeness()
+    filter each run's anomalies once and share them.
     """
-    records = []
+    cols: dict[str, list] = {
+        "Run Year": [], "Total Rows": [], "Anomaly Count": [], "Girth Weld Count": [],
+        "Depth % Missing": [], "Length Missing": [], "Width Missing": [],
+        "Clock Missing": [], "Distance Range": [], "Joint Range": [],
+    }
+    missing_cols = (("Depth % Missing", "depth_pct"), ("Length Missing", "length_in"),
+                    ("Width Missing", "width_in"), ("Clock Missing", "clock_hours"))
     for year, df in runs.items():
-        anomalies = get_anomalies(df)
+        if anomalies_by_year is not None:
+            anomalies = anomalies_by_year[year]
+        else:
+            anomalies = get_anomalies(df, copy=False)
         gw = get_girth_welds(df)
-        record = {
-            "Run Year": year,
-            "Total Rows": len(df),
-            "Anomaly Count": len(anomalies),
-            "Girth Weld Count": len(gw),
-            "Depth % Missing": anomalies["depth_pct"].isna().sum() if "depth_pct" in df.columns else "N/A",
-            "Length Missing": anomalies["length_in"].isna().sum() if "length_in" in df.columns else "N/A",
-            "Width Missing": anomalies["width_in"].isna().sum() if "width_in" in df.columns else "N/A",
-            "Clock Missing": anomalies["clock_hours"].isna().sum() if "clock_hours" in df.columns else "N/A",
-            "Distance Range": f"{df['log_distance_ft'].min():.1f} – {df['log_distance_ft'].max():.1f}",
-            "Joint Range": f"{gw['joint_number'].min()} – {gw['joint_number'].max()}",
-        }
-        records.append(record)
-    return pd.DataFrame(records)
-
-
-def column_completeness(runs: dict[int, pd.DataFrame]) -> pd.DataFrame:
+        cols["Run Year"].append(year)
+        cols["Total Rows"].append(len(df))
+        cols["Anomaly Count"].append(len(anomalies))
+        cols["Girth Weld Count"].append(len(gw))
+        for label, col in missing_cols:
+            cols[label].append(anomalies[col].isna().sum() if col in df.columns else "N/A")
+        cols["Distance Range"].append(f"{df['log_distance_ft'].min():.1f} – {df['log_distance_ft'].max():.1f}")
+        cols["Joint Range"].append(f"{gw['joint_number'].min()} – {gw['joint_number'].max()}")
+    return pd.DataFrame(cols)
+
+
+def column_completeness(
+    runs: dict[int, pd.DataFrame],
+    anomalies_by_year: dict[int, pd.DataFrame] | None = None,
+) -> pd.DataFrame:
     """Compute column-level completeness (% non-null) for anomaly rows per run.
 
     For each run year, filters to anomaly rows only (since those are the rows
     used in analysis), then calculates the percentage of non-null values for
     each key measurement column. Returns a long-format DataFrame with one row
     per (run_year, column) pair, suitable for heatmap or bar chart rendering
-    in the Data Overview dashboard.
+    in the Data Overview dashboard. `anomalies_by_year` is as in
+    data_quality_report().
     """
     key_cols = ["depth_pct", "length_in", "width_in", "clock_hours",
                 "log_distance_ft", "joint_number", "wall_thickness_in",
                 "id_od", "dist_to_us_weld_ft"]
-    rows = []
+    n_cols = len(key_cols)
+    years, pcts = [], []
     for year, df in runs.items():
-        anom = get_anomalies(df)
+        if anomalies_by_year is not None:
+            anom = anomalies_by_year[year]
+        else:
+            anom = get_anomalies(df, copy=False)
+        years.extend([year] * n_cols)
+        if len(anom) == 0:
+            pcts.extend([0.0] * n_cols)
+            continue
         for col in key_cols:
-            if col in anom.columns:
-                pct = (anom[col].notna().sum() / len(anom) * 100) if len(anom) > 0 else 0
-                rows.append({"Run Year": year, "Column": col, "Completeness %": round(pct, 1)})
-            else:
-                rows.append({"Run Year": year, "Column": col, "Completeness %": 0.0})
-    return pd.DataFrame(rows)
+            pcts.append(anom[col].notna().sum() / len(anom) * 100 if col in anom.columns else 0.0)
+    return pd.DataFrame({
+        "Run Year": years,
+        "Column": key_cols * len(runs),
+        "Completeness %": np.asarray(pcts, dtype=np.float64).round(1),
+    })
@@ -8,10 +8,14 @@ dashboard.
 
 import numpy as np
 import pandas as pd
-from scipy import stats as sp_stats
 
 from config import MAX_PLAUSIBLE_GROWTH_RATE, WALL_LOSS_REPAIR_THRESHOLD
 
+from _numba_support import load_kernels
+
+_growth_numba = load_kernels("_growth_numba")
+HAS_NUMBA = _growth_numba is not None
+
 
 def calculate_growth_rates(matches_df: pd.DataFrame) -> pd.DataFrame:
     """Add comprehensive growth metrics to matches DataFrame.
@@ -24,48 +28,93 @@ def calculate_growth_rates(matches_df: pd.DataFrame) -> pd.DataFrame:
       - risk_score: composite 0-100 urgency score
       - risk_category: categorical label derived from risk_score
     """
-    if matches_df.empty:
+    # len() of the index is the cheapest emptiness test (DataFrame.empty
+    # goes through shape); the growth helpers also run on small sub-frames
+    if len(matches_df.index) == 0:
         return matches_df
 
-    df = matches_df.copy()
-
-    # Remaining wall (% intact)
-    df["remaining_wall_pct"] = 100.0 - df["later_depth_pct"]
-
-    # Remaining life at current growth rate (years until 80% wall loss)
-    df["remaining_life_years"] = df.apply(_remaining_life, axis=1)
-
-    # Growth classification
-    df["growth_class"] = df["depth_growth_rate"].apply(_classify_growth)
+    # New columns are computed from the input arrays and attached in a single
+    # assign() (a shallow copy under copy-on-write) instead of copying the
+    # whole match table up front and inserting them one by one
+    remaining_wall, remaining_life, growth_codes, risk_score, risk_codes = _growth_columns(
+        matches_df["later_depth_pct"].to_numpy(dtype=float),
+        matches_df["depth_growth_rate"].to_numpy(dtype=float),
+    )
+    df = matches_df.assign(
+        remaining_wall_pct=remaining_wall,
+        remaining_life_years=remaining_life,
+        growth_class=pd.Categorical.from_codes(growth_codes, dtype=_GROWTH_CLASS_DTYPE),
+        risk_score=risk_score,
+        risk_category=pd.Categorical.from_codes(risk_codes, dtype=_RISK_CATEGORY_DTYPE),
+    )
 
-    # Risk score (0-100): higher = more urgent
-    df["risk_score"] = df.apply(_compute_risk_score, axis=1)
+    return df
 
-    # Risk category
-    df["risk_category"] = df["risk_score"].apply(_classify_risk)
 
-    return df
+def _growth_columns(depth: np.ndarray, rate: np.ndarray) -> tuple[np.ndarray, ...]:
+    """Compute the calculate_growth_rates columns from the depth / rate arrays.
 
+    Returns (remaining_wall_pct, remaining_life_years, growth-class codes,
+    risk_score, risk-category codes); the codes index _GROWTH_CLASS_DTYPE /
+    _RISK_CATEGORY_DTYPE. With numba, one fused kernel pass over both
+    arrays computes them all.
+    """
+    if HAS_NUMBA:
+        n_rows = len(depth)
+        remaining_wall, remaining_life, risk_score = np.empty(n_rows), np.empty(n_rows), np.empty(n_rows)
+        growth_codes = np.empty(n_rows, dtype=np.int8)
+        risk_codes = np.empty(n_rows, dtype=np.int8)
+        _growth_numba.growth_columns_kernel(
+            np.ascontiguousarray(depth), np.ascontiguousarray(rate),
+            WALL_LOSS_REPAIR_THRESHOLD, MAX_PLAUSIBLE_GROWTH_RATE,
+            _DEPTH_SCORE_SCALE, _RATE_SCORE_SCALE,
+            remaining_wall, remaining_life, growth_codes, risk_score, risk_codes,
+        )
+        return remaining_wall, remaining_life, growth_codes, risk_score, risk_codes
 
-def _remaining_life(row) -> float:
+    # Risk score (0-100): higher = more urgent
+    risk_score = _compute_risk_score(depth, rate)
+    return (
+        # Remaining wall (% intact)
+        100.0 - depth,
+        # Remaining life at current growth rate (years until 80% wall loss)
+        _remaining_life(rate, depth),
+        # Growth classification
+        _classify_growth(rate),
+        risk_score,
+        # Risk category
+        _classify_risk(risk_score),
+    )
+
+
+def _remaining_life(rate: np.ndarray, current: np.ndarray) -> np.ndarray:
     """Estimate years until depth reaches repair threshold.
 
     Calculates years until the anomaly depth reaches 80% wall loss (the
     repair threshold) at the current growth rate. Returns NaN for stable
     or shrinking anomalies (rate <= 0) since they are not progressing
-    toward the threshold.
+    toward the threshold. Operates on whole columns at once.
     """
-    rate = row.get("depth_growth_rate", np.nan)
-    current = row.get("later_depth_pct", np.nan)
-    if np.isnan(rate) or np.isnan(current) or rate <= 0:
-        return np.nan
     remaining_capacity = WALL_LOSS_REPAIR_THRESHOLD - current
-    if remaining_capacity <= 0:
-        return 0.0
-    return round(remaining_capacity / rate, 1)
+    with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+        years = np.round(remaining_capacity / rate, 1)
+    # NaN rate/depth compare False, so they fall through to NaN
+    return np.where(
+        rate > 0,
+        np.where(remaining_capacity <= 0, 0.0, years),
+        np.nan,
+    )
 
 
-def _classify_growth(rate) -> str:
+# Right-closed bin edges for _classify_growth. The first edge below zero is
+# the largest negative double, so (edge, 0] holds exactly rate == 0 and the
+# lowest bin (include_lowest) holds every rate < 0, -inf included.
+_GROWTH_BINS = (-np.inf, np.nextafter(0.0, -1.0), 0.0, 1.0, 3.0, MAX_PLAUSIBLE_GROWTH_RATE, np.inf)
+_GROWTH_LABELS = ("Apparent Shrinkage", "Stable", "Low", "Moderate", "High", "Severe")
+_GROWTH_CLASS_DTYPE = pd.CategoricalDtype([*_GROWTH_LABELS, "Unknown"], ordered=True)
+
+
+def _classify_growth(rate: pd.Series) -> pd.Series:
     """Classify growth rate into categories.
 
     Classification bands (%/yr):
@@ -75,23 +124,19 @@ def _classify_growth(rate) -> str:
       1 < rate <= 3 -> Moderate
       3 < rate <= 5 -> High
       rate > 5      -> Severe
+    Missing rates are "Unknown". Bins the whole column with pd.cut and
+    returns codes into _GROWTH_CLASS_DTYPE.
     """
-    if pd.isna(rate):
-        return "Unknown"
-    if rate < 0:
-        return "Apparent Shrinkage"
-    if rate == 0:
-        return "Stable"
-    if rate <= 1.0:
-        return "Low"
-    if rate <= 3.0:
-        return "Moderate"
-    if rate <= MAX_PLAUSIBLE_GROWTH_RATE:
-        return "High"
-    return "Severe"
-
-
-def _compute_risk_score(row) -> float:
+    return _bin_codes(rate, _GROWTH_BINS, include_lowest=True)
+
+
+# Risk-score component scales, folded once: each component is worth 50 points
+# at the repair threshold / plausible-growth cap
+_DEPTH_SCORE_SCALE = 50.0 / WALL_LOSS_REPAIR_THRESHOLD
+_RATE_SCORE_SCALE = 50.0 / MAX_PLAUSIBLE_GROWTH_RATE
+
+
+def _compute_risk_score(depth: np.ndarray, rate: np.ndarray) -> np.ndarray:
     """Compute risk score (0-100) based on current depth and growth rate.
 
     Composite score with two equally-weighted components:
@@ -100,24 +145,28 @@ def _compute_risk_score(row) -> float:
       - rate_component (0-50): growth rate normalized by the 5%/yr
         plausible-growth cap; faster-growing anomalies score higher.
     Each component is clamped to its 0-50 range before summing.
+    Operates on whole columns at once.
     """
-    depth = row.get("later_depth_pct", 0)
-    rate = row.get("depth_growth_rate", 0)
-    if pd.isna(depth):
-        depth = 0
-    if pd.isna(rate) or rate < 0:
-        rate = 0
+    depth = np.nan_to_num(depth, nan=0.0)
+    # Missing and negative (apparent shrinkage) rates contribute nothing
+    rate = np.where(rate > 0, rate, 0.0)
 
     # Depth component (0-50): deeper = riskier
-    depth_score = min(50, depth * 50 / WALL_LOSS_REPAIR_THRESHOLD)
+    depth_score = np.minimum(50, depth * _DEPTH_SCORE_SCALE)
 
     # Growth rate component (0-50): faster = riskier
-    rate_score = min(50, rate * 50 / MAX_PLAUSIBLE_GROWTH_RATE)
+    rate_score = np.minimum(50, rate * _RATE_SCORE_SCALE)
+
+    return np.round(depth_score + rate_score, 1)
 
-    return round(depth_score + rate_score, 1)
 
+# Left-closed bin edges for _classify_risk (a score on an edge moves up a band)
+_RISK_BINS = (-np.inf, 30.0, 50.0, 70.0, np.inf)
+_RISK_LABELS = ("Low", "Medium", "High", "Critical")
+_RISK_CATEGORY_DTYPE = pd.CategoricalDtype([*_RISK_LABELS, "Unknown"], ordered=True)
 
-def _classify_risk(score) -> str:
+
+def _classify_risk(score: np.ndarray) -> np.ndarray:
     """Classify the numeric risk score into a named category.
 
     Thresholds:
@@ -125,20 +174,30 @@ def _classify_risk(score) -> str:
       score >= 50 -> High
       score >= 30 -> Medium
       score <  30 -> Low
+    Missing scores are "Unknown". Bins the whole column with pd.cut and
+    returns codes into _RISK_CATEGORY_DTYPE.
     """
-    if pd.isna(score):
-        return "Unknown"
-    if score >= 70:
-        return "Critical"
-    if score >= 50:
-        return "High"
-    if score >= 30:
-        return "Medium"
-    return "Low"
+    return _bin_codes(score, _RISK_BINS, right=False)
+
+
+def _bin_codes(values: np.ndarray, bins: tuple, **cut_kwargs) -> np.ndarray:
+    """Bin `values` with pd.cut straight into int8 category codes.
+
+    Missing values get the code after the last bin, i.e. the trailing
+    "Unknown" category of the shared dtypes, so no label strings or
+    add_categories/fillna passes are built per call.
+    """
+    codes = pd.cut(values, bins=bins, labels=False, **cut_kwargs).astype(float)
+    return np.where(np.isnan(codes), len(bins) - 1, codes).astype(np.int8)
 
 
 # ── Multi-run growth trend prediction ─────────────────────────────────────────
 
+_TREND_YEARS = np.array([2007, 2015, 2022], dtype=float)
+# Gaps between consecutive runs (8 and 7 years), for the acceleration test
+_TREND_GAP_EARLY, _TREND_GAP_LATE = np.diff(_TREND_YEARS)
+
+
 def predict_growth_trends(multi_run_matches: pd.DataFrame) -> pd.DataFrame:
     """For anomalies tracked across 3 runs, fit growth models and predict.
 
@@ -150,51 +209,78 @@ def predict_growth_trends(multi_run_matches: pd.DataFrame) -> pd.DataFrame:
 
     Expects columns: depth_2007, depth_2015, depth_2022 (from multi_run chaining).
     """
-    if multi_run_matches.empty:
-        return multi_run_matches
-
-    df = multi_run_matches.copy()
-    years = np.array([2007, 2015, 2022], dtype=float)
-
-    predictions = []
-    for _, row in df.iterrows():
-        depths = np.array([
-            row.get("depth_2007", np.nan),
-            row.get("depth_2015", np.nan),
-            row.get("depth_2022", np.nan),
-        ])
-
-        valid = ~np.isnan(depths)
-        n_valid = valid.sum()
-
-        pred = {
-            "linear_rate": np.nan,
-            "linear_r2": np.nan,
-            "predicted_2030": np.nan,
-            "predicted_2035": np.nan,
-            "is_accelerating": False,
-        }
-
-        if n_valid >= 2:
-            y_valid = years[valid]
-            d_valid = depths[valid]
-
-            # Linear fit
-            slope, intercept, r_value, _, _ = sp_stats.linregress(y_valid, d_valid)
-            pred["linear_rate"] = round(slope, 4)
-            pred["linear_r2"] = round(r_value ** 2, 4)
-            pred["predicted_2030"] = round(slope * 2030 + intercept, 1)
-            pred["predicted_2035"] = round(slope * 2035 + intercept, 1)
+    df = multi_run_matches
+    n_rows = len(df.index)
+    if n_rows == 0:
+        return df
+
+    depths = np.column_stack([
+        df[col].to_numpy(dtype=float) if col in df.columns else np.full(n_rows, np.nan)
+        for col in ("depth_2007", "depth_2015", "depth_2022")
+    ])
+    fit = (~np.isnan(depths)).sum(axis=1) >= 2
+    slope, intercept, r_value, is_accelerating = _fit_trends(depths)
+
+    pred_df = pd.DataFrame({
+        "linear_rate": np.where(fit, np.round(slope, 4), np.nan),
+        "linear_r2": np.where(fit, np.round(r_value ** 2, 4), np.nan),
+        "predicted_2030": np.where(fit, np.round(slope * 2030 + intercept, 1), np.nan),
+        "predicted_2035": np.where(fit, np.round(slope * 2035 + intercept, 1), np.nan),
+        "is_accelerating": is_accelerating,
+    }, index=df.index)
+    return pd.concat([df, pred_df], axis=1)
 
-        if n_valid == 3:
-            # Check for acceleration (quadratic fit)
-            coeffs = np.polyfit(years[valid], depths[valid], 2)
-            pred["is_accelerating"] = coeffs[0] > 0  # Positive quadratic = acceleration
 
-        predictions.append(pred)
+def _fit_trends(depths: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Per-row linear fit and acceleration flag for an (N, 3) depth array.
 
-    pred_df = pd.DataFrame(predictions, index=df.index)
-    return pd.concat([df, pred_df], axis=1)
+    Returns (slope, intercept, r_value, is_accelerating). Rows with fewer
+    than two depths get NaN fits. Rows are fitted in parallel by the numba
+    kernel when it is available.
+    """
+    if HAS_NUMBA:
+        n_rows = len(depths)
+        slope, intercept, r_value = np.empty(n_rows), np.empty(n_rows), np.empty(n_rows)
+        is_accelerating = np.empty(n_rows, dtype=bool)
+        _growth_numba.fit_trends_kernel(
+            np.ascontiguousarray(depths), _TREND_YEARS, _TREND_GAP_EARLY, _TREND_GAP_LATE,
+            slope, intercept, r_value, is_accelerating,
+        )
+        return slope, intercept, r_value, is_accelerating
+
+    years = _TREND_YEARS
+    valid = ~np.isnan(depths)
+    n_valid = valid.sum(axis=1)
+
+    # Linear fit for every row at once, with linregress's own formulas:
+    # masked means, then the biased (co)variances ssxm / ssxym / ssym of the
+    # valid points (missing runs contribute 0 to every sum)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_mean = np.where(valid, years, 0.0).sum(axis=1) / n_valid
+        y_mean = np.where(valid, depths, 0.0).sum(axis=1) / n_valid
+        dx = np.where(valid, years - x_mean[:, None], 0.0)
+        dy = np.where(valid, depths - y_mean[:, None], 0.0)
+        # Per-row 2x2 covariance as one batched matmul (np.cov's own dot,
+        # so the sums round exactly as linregress's do)
+        dev = np.stack([dx, dy], axis=1)
+        cov = (dev @ dev.transpose(0, 2, 1)) * (1.0 / n_valid)[:, None, None]
+        ssxm, ssxym, ssym = cov[:, 0, 0], cov[:, 0, 1], cov[:, 1, 1]
+        slope = ssxym / ssxm
+        intercept = y_mean - slope * x_mean
+        r_value = np.clip(ssxym / np.sqrt(ssxm * ssym), -1.0, 1.0)
+    # Flat depths have no defined correlation (linregress: NaN)
+    r_value = np.where(ssym == 0.0, np.where(ssxym == 0.0, np.nan, 0.0), r_value)
+
+    # Acceleration: the quadratic through the three points has a positive
+    # leading coefficient exactly when the later per-year rate exceeds the
+    # earlier one; cross-multiplied by the gaps so no division is needed
+    # (any missing depth compares False)
+    with np.errstate(invalid="ignore"):
+        is_accelerating = (
+            _TREND_GAP_EARLY * (depths[:, 2] - depths[:, 1])
+            > _TREND_GAP_LATE * (depths[:, 1] - depths[:, 0])
+        )
+    return slope, intercept, r_value, is_accelerating
 
 
 def growth_summary_stats(matches_df: pd.DataFrame) -> dict:
@@ -204,23 +290,52 @@ def growth_summary_stats(matches_df: pd.DataFrame) -> dict:
     and percentage breakdowns by severity) used to populate the Growth
     Analysis dashboard cards and charts.
     """
-    if matches_df.empty:
+    if len(matches_df.index) == 0:
         return {}
 
-    rates = matches_df["depth_growth_rate"].dropna()
+    # One NaN-free float array; the rate stats and the percentages are each
+    # rounded as a single array and handed back as Python floats by tolist()
+    rates = matches_df["depth_growth_rate"].to_numpy(dtype=float)
+    rates = rates[~np.isnan(rates)]
+    n = rates.size
+    if n == 0:
+        # Same shape as before: all stats NaN / percentages of nothing
+        nan = float("nan")
+        return {
+            "count": 0, "mean_rate": nan, "median_rate": nan, "std_rate": nan,
+            "min_rate": nan, "max_rate": nan,
+            "pct_negative": nan, "pct_high": nan, "pct_severe": nan,
+        }
+    mean_rate, median_rate, std_rate, min_rate, max_rate = np.round([
+        rates.mean(), np.median(rates), rates.std(ddof=1) if n > 1 else np.nan,
+        rates.min(), rates.max(),
+    ], 3).tolist()
+    pct_negative, pct_high, pct_severe = np.round(np.array([
+        np.count_nonzero(rates < 0),
+        np.count_nonzero(rates > 3.0),
+        np.count_nonzero(rates > MAX_PLAUSIBLE_GROWTH_RATE),
+    ]) / n * 100, 1).tolist()
     return {
-        "count": len(rates),
-        "mean_rate": round(rates.mean(), 3),
-        "median_rate": round(rates.median(), 3),
-        "std_rate": round(rates.std(), 3),
-        "min_rate": round(rates.min(), 3),
-        "max_rate": round(rates.max(), 3),
-        "pct_negative": round((rates < 0).mean() * 100, 1),
-        "pct_high": round((rates > 3.0).mean() * 100, 1),
-        "pct_severe": round((rates > MAX_PLAUSIBLE_GROWTH_RATE).mean() * 100, 1),
+        "count": n,
+        "mean_rate": mean_rate,
+        "median_rate": median_rate,
+        "std_rate": std_rate,
+        "min_rate": min_rate,
+        "max_rate": max_rate,
+        "pct_negative": pct_negative,
+        "pct_high": pct_high,
+        "pct_severe": pct_severe,
     }
 
 
+# Columns shown in the top-concerns table
+_TOP_CONCERN_COLS = [
+    "later_joint", "later_distance", "later_clock",
+    "later_depth_pct", "depth_growth_rate", "remaining_life_years",
+    "risk_score", "risk_category", "confidence_label",
+]
+
+
 def top_concerns(matches_df: pd.DataFrame, n: int = 20) -> pd.DataFrame:
     """Return the top N highest-risk anomalies.
 
@@ -228,10 +343,37 @@ def top_concerns(matches_df: pd.DataFrame, n: int = 20) -> pd.DataFrame:
     subset of key columns (location, depth, growth rate, remaining life,
     risk info, and confidence) for display in the dashboard table.
     """
-    if matches_df.empty or "risk_score" not in matches_df.columns:
+    if len(matches_df.index) == 0 or "risk_score" not in matches_df.columns:
         return pd.DataFrame()
-    return matches_df.nlargest(n, "risk_score")[[
-        "later_joint", "later_distance", "later_clock",
-        "later_depth_pct", "depth_growth_rate", "remaining_life_years",
-        "risk_score", "risk_category", "confidence_label",
-    ]].reset_index(drop=True)
+    # Column subset taken on the n selected rows only; relabelling the index
+    # in place avoids the extra frame reset_index() would build
+    top = matches_df.iloc[_top_n_positions(matches_df["risk_score"].to_numpy(dtype=float), n)]
+    top = top.loc[:, _TOP_CONCERN_COLS]
+    top.index = pd.RangeIndex(len(top))
+    return top
+
+
+def _top_n_positions(scores: np.ndarray, n: int) -> np.ndarray:
+    """Positions of the n largest scores, highest first (same rows as nlargest).
+
+    np.partition finds the n-th largest value in O(N); only the rows at or
+    above it are then sorted. NaN scores only fill in when there are fewer
+    than n real ones and, as with nlargest's keep="first", ties at the cut-off
+    and in the ordering go to the earlier row.
+    """
+    n = max(n, 0)
+    missing = np.isnan(scores)
+    valid = np.flatnonzero(~missing)
+    k = min(n, valid.size)
+    if k < n:
+        # Fewer real scores than requested: nlargest pads with the NaN rows
+        ranked = valid[np.argsort(-scores[valid], kind="stable")]
+        return np.concatenate([ranked, np.flatnonzero(missing)[:n - k]])
+    if k == 0:
+        return valid[:0]
+    valid_scores = scores[valid]
+    cutoff = np.partition(valid_scores, valid.size - k)[valid.size - k]
+    above = valid[valid_scores > cutoff]
+    at_cutoff = valid[valid_scores == cutoff][:k - above.size]
+    chosen = np.sort(np.concatenate([above, at_cutoff]))
+    return chosen[np.argsort(-scores[chosen], kind="stable")]
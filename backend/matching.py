@@ -13,8 +13,10 @@ Implements a three-stage approach:
 
 import numpy as np
 import pandas as pd
-from scipy.spatial import KDTree
+from scipy.spatial import cKDTree
 from scipy.optimize import linear_sum_assignment
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
 
 from config import (
     DISTANCE_TOLERANCE_FT, CLOCK_TOLERANCE_HOURS,
@@ -24,6 +26,17 @@ from config import (
 )
 from data_ingestion import get_anomalies
 
+from _numba_support import load_kernels
+
+_matching_numba = load_kernels("_matching_numba")
+HAS_NUMBA = _matching_numba is not None
+
+try:
+    from lap import lapjv
+    HAS_LAP = True
+except ImportError:
+    HAS_LAP = False
+
 
 # ── Clock utilities ───────────────────────────────────────────────────────────
 
@@ -41,6 +54,13 @@ def clock_distance(h1: float, h2: float) -> float:
     return min(diff, 12.0 - diff)
 
 
+def _clock_distance_vec(h1: np.ndarray, h2: np.ndarray) -> np.ndarray:
+    """Element-wise clock_distance over two arrays of clock positions."""
+    diff = np.abs(h1 - h2) % 12.0
+    diff = np.minimum(diff, 12.0 - diff)
+    return np.where(np.isnan(h1) | np.isnan(h2), 6.0, diff)
+
+
 def clock_to_trig(hours: float) -> tuple[float, float]:
     """Embed clock hours as (cos, sin) on the unit circle for KD-tree search.
 
@@ -60,9 +80,14 @@ def clock_to_trig(hours: float) -> tuple[float, float]:
 
 # ── Similarity scoring ────────────────────────────────────────────────────────
 
-def compute_similarity(a_later: pd.Series, a_earlier: pd.Series,
-                       years_between: float) -> float:
-    """Compute weighted multi-attribute similarity score (0-1).
+def compute_similarity(later: dict[str, np.ndarray], earlier: dict[str, np.ndarray],
+                       later_idx: np.ndarray, earlier_idx: np.ndarray,
+                       clk_diff: np.ndarray | None = None) -> np.ndarray:
+    """Compute weighted multi-attribute similarity scores (0-1) for candidate pairs.
+
+    `later` / `earlier` are the _anomaly_arrays() columns of the two runs and
+    pair k is (later_idx[k], earlier_idx[k]); all pairs are scored at once.
+    `clk_diff` is the pairs' clock distance when the caller already has it.
 
     Five sub-scores are blended using configurable weights:
       - Distance:   linear decay over the distance tolerance window.
@@ -76,37 +101,34 @@ def compute_similarity(a_later: pd.Series, a_earlier: pd.Series,
       - Type:       exact-match = 1.0; compatible types = 0.7.
     """
     # Distance score -- linear decay: 1.0 at 0 ft difference, 0.0 at tolerance
-    dist_diff = abs(a_later["corrected_distance"] - a_earlier["corrected_distance"])
-    s_dist = max(0, 1.0 - dist_diff / DISTANCE_TOLERANCE_FT)
+    dist_diff = np.abs(later["corrected_distance"][later_idx] - earlier["corrected_distance"][earlier_idx])
+    s_dist = np.maximum(0.0, 1.0 - dist_diff / DISTANCE_TOLERANCE_FT)
 
     # Clock score -- linear decay normalised against 6h (half the clock face)
-    clk_diff = clock_distance(a_later.get("clock_hours", np.nan),
-                               a_earlier.get("clock_hours", np.nan))
-    s_clock = max(0, 1.0 - clk_diff / (CLOCK_TOLERANCE_HOURS * 6.0))  # Normalize to 6h max
+    if clk_diff is None:
+        clk_diff = _clock_distance_vec(later["clock_hours"][later_idx], earlier["clock_hours"][earlier_idx])
+    s_clock = np.maximum(0.0, 1.0 - clk_diff / (CLOCK_TOLERANCE_HOURS * 6.0))  # Normalize to 6h max
 
     # Depth score -- asymmetric penalty: growth is expected, shrinkage is suspicious
     #   Growth (depth_diff >= 0): gentle penalty, divided by 30
     #   Shrinkage (depth_diff < 0): harsh penalty, divided by 10
-    d_later = a_later.get("depth_pct", np.nan)
-    d_earlier = a_earlier.get("depth_pct", np.nan)
-    if np.isnan(d_later) or np.isnan(d_earlier):
-        s_depth = 0.5
-    else:
-        depth_diff = d_later - d_earlier
-        if depth_diff >= 0:
-            s_depth = max(0, 1.0 - depth_diff / 30.0)
-        else:
-            s_depth = max(0, 1.0 - abs(depth_diff) / 10.0)
+    #   Either depth unknown: neutral 0.5
+    depth_diff = later["depth_pct"][later_idx] - earlier["depth_pct"][earlier_idx]
+    s_depth = np.where(
+        depth_diff >= 0,
+        np.maximum(0.0, 1.0 - depth_diff / 30.0),
+        np.maximum(0.0, 1.0 - np.abs(depth_diff) / 10.0),
+    )
+    s_depth = np.where(np.isnan(depth_diff), 0.5, s_depth)
 
     # Dimensional similarity -- combined length + width diff, normalised to 6 in
-    len_diff = _safe_diff(a_later.get("length_in"), a_earlier.get("length_in"))
-    wid_diff = _safe_diff(a_later.get("width_in"), a_earlier.get("width_in"))
-    s_dim = max(0, 1.0 - (len_diff + wid_diff) / 6.0)
+    len_diff = _safe_diff(later["length_in"][later_idx], earlier["length_in"][earlier_idx])
+    wid_diff = _safe_diff(later["width_in"][later_idx], earlier["width_in"][earlier_idx])
+    s_dim = np.maximum(0.0, 1.0 - (len_diff + wid_diff) / 6.0)
 
     # Type compatibility -- exact match scores 1.0, compatible pair scores 0.7
-    type_later = a_later.get("event_type", "")
-    type_earlier = a_earlier.get("event_type", "")
-    s_type = 1.0 if type_later == type_earlier else 0.7
+    same_type = later["event_type"][later_idx] == earlier["event_type"][earlier_idx]
+    s_type = np.where(same_type, 1.0, 0.7)
 
     score = (WEIGHT_DISTANCE * s_dist +
              WEIGHT_CLOCK * s_clock +
@@ -116,8 +138,8 @@ def compute_similarity(a_later: pd.Series, a_earlier: pd.Series,
     return score
 
 
-def _safe_diff(a, b) -> float:
-    """Absolute difference with NaN handling.
+def _safe_diff(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Element-wise absolute difference with NaN handling.
 
     When either value is missing, returns a moderate penalty of 1.5 rather
     than 0 (which would falsely reward missing data) or the maximum
@@ -125,9 +147,7 @@ def _safe_diff(a, b) -> float:
     the middle of the typical dimensional range, providing a cautious but
     not extreme contribution to the similarity score.
     """
-    if pd.isna(a) or pd.isna(b):
-        return 1.5  # Moderate penalty for missing data
-    return abs(float(a) - float(b))
+    return np.where(np.isnan(a) | np.isnan(b), 1.5, np.abs(a - b))
 
 
 # ── Type compatibility ────────────────────────────────────────────────────────
@@ -148,6 +168,23 @@ def types_compatible(type_a: str, type_b: str) -> bool:
     return type_b in compat_a
 
 
+def _type_compatibility(types_a: np.ndarray, types_b: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Integer-code two event-type arrays and tabulate types_compatible.
+
+    Both arrays are coded against one shared set of K distinct types.
+    Returns (codes_a, codes_b, compat), where compat[code_a, code_b] is
+    types_compatible for that pair of types.  The table is (K+1) x (K+1):
+    missing types get code -1, which indexes the all-False last row and
+    column.
+    """
+    codes, uniques = pd.factorize(np.concatenate([types_a, types_b]))
+    compat = np.zeros((len(uniques) + 1, len(uniques) + 1), dtype=bool)
+    for a, type_a in enumerate(uniques):
+        for b, type_b in enumerate(uniques):
+            compat[a, b] = types_compatible(type_a, type_b)
+    return codes[:len(types_a)], codes[len(types_a):], compat
+
+
 # ── Main matching pipeline ────────────────────────────────────────────────────
 
 def match_anomalies(
@@ -161,9 +198,9 @@ def match_anomalies(
       1. Extract anomaly rows from each run via ``get_anomalies()``.
       2. Embed earlier-run anomalies into 3-D space (distance, cos_clock,
          sin_clock) and build a KD-tree for fast spatial lookup.
-      3. For each later-run anomaly, query the KD-tree to find candidate
-         matches within distance and clock tolerances, checking type
-         compatibility and computing pairwise similarity scores.
+      3. Query the KD-tree for all later-run anomalies in one batch to find
+         candidate matches within distance and clock tolerances, checking
+         type compatibility and computing pairwise similarity scores.
       4. Populate a cost matrix (cost = 1 - similarity) with non-candidate
          cells set to a large sentinel so the solver never picks them.
       5. Solve the min-cost assignment with ``scipy.optimize.linear_sum_assignment``
@@ -191,84 +228,85 @@ def match_anomalies(
 
     # Build KD-tree on earlier-run anomalies for O(n log n) candidate lookup
     earlier_points = _build_search_points(anom_earlier)
-    tree = KDTree(earlier_points)
-
-    # For each later anomaly, find candidates and compute scores
-    # Build cost matrix (sparse: only fill candidate pairs)
-    LARGE_COST = 1e6  # Sentinel cost -- prevents the solver from selecting non-candidate pairs
-    cost_matrix = np.full((n_later, n_earlier), LARGE_COST)
-    candidate_counts = np.zeros(n_later, dtype=int)  # Track per-anomaly candidate count for uniqueness scoring
-
-    # Search radius: distance tolerance in the embedded space
-    # Scale factors: distance in ft, clock in trig coords (range -1 to 1)
-    search_radius = max(DISTANCE_TOLERANCE_FT, 2.0)  # Conservative radius
-
-    for i in range(n_later):
-        later_point = _build_search_point_single(anom_later.iloc[i])
-        # Query KD-tree for nearby candidates
-        candidate_indices = tree.query_ball_point(later_point, r=search_radius)
-
-        for j in candidate_indices:
-            a_l = anom_later.iloc[i]
-            a_e = anom_earlier.iloc[j]
-
-            # Verify distance tolerance
-            dist_diff = abs(a_l["corrected_distance"] - a_e["corrected_distance"])
-            if dist_diff > DISTANCE_TOLERANCE_FT:
-                continue
-
-            # Verify clock tolerance
-            clk_diff = clock_distance(
-                a_l.get("clock_hours", np.nan),
-                a_e.get("clock_hours", np.nan)
-            )
-            if clk_diff > CLOCK_TOLERANCE_HOURS:
-                continue
-
-            # Verify type compatibility
-            if not types_compatible(a_l.get("event_type", ""), a_e.get("event_type", "")):
-                continue
-
-            # Compute similarity and store as cost (1 - similarity) for minimisation
-            sim = compute_similarity(a_l, a_e, years_between)
-            cost_matrix[i, j] = 1.0 - sim
-            candidate_counts[i] += 1
+    tree = cKDTree(earlier_points)
+
+    # Search radius: a pair within both tolerances is at most
+    # DISTANCE_TOLERANCE_FT apart along each of the distance axis and the
+    # (scaled) clock plane, so it lies within sqrt(2) x that of each other;
+    # the exact tolerance checks below then trim the ball to the window
+    search_radius = DISTANCE_TOLERANCE_FT * np.sqrt(2.0) * (1 + 1e-9)  # Conservative radius
+
+    # Scoring columns pulled out once instead of read per pair from row Series
+    later = _anomaly_arrays(anom_later)
+    earlier = _anomaly_arrays(anom_earlier)
+
+    # Query the KD-tree for every later anomaly in one batched call and
+    # flatten the per-anomaly candidate lists into (later, earlier) pairs
+    candidate_lists = tree.query_ball_point(_build_search_points(anom_later), r=search_radius, workers=-1)
+    n_candidates = np.fromiter(map(len, candidate_lists), dtype=np.intp, count=n_later)
+    pair_later = np.repeat(np.arange(n_later), n_candidates)
+    pair_earlier = np.fromiter(
+        (j for candidate_indices in candidate_lists for j in candidate_indices),
+        dtype=np.intp, count=int(n_candidates.sum()),
+    )
+
+    # Verify distance tolerance
+    dist_diff = np.abs(later["corrected_distance"][pair_later] - earlier["corrected_distance"][pair_earlier])
+    keep = dist_diff <= DISTANCE_TOLERANCE_FT
+    pair_later, pair_earlier = pair_later[keep], pair_earlier[keep]
+
+    # Verify clock tolerance (the clock distances are reused for scoring)
+    clk_diff = _clock_distance_vec(later["clock_hours"][pair_later], earlier["clock_hours"][pair_earlier])
+    keep = clk_diff <= CLOCK_TOLERANCE_HOURS
+    pair_later, pair_earlier, clk_diff = pair_later[keep], pair_earlier[keep], clk_diff[keep]
+
+    # Verify type compatibility with one lookup per pair in the code x code table
+    code_l, code_e, compat = _type_compatibility(later["event_type"], earlier["event_type"])
+    keep = compat[code_l[pair_later], code_e[pair_earlier]]
+    pair_later, pair_earlier, clk_diff = pair_later[keep], pair_earlier[keep], clk_diff[keep]
+
+    # Score all candidate pairs at once and store as cost (1 - similarity)
+    # for minimisation
+    sim = compute_similarity(later, earlier, pair_later, pair_earlier, clk_diff)
+    pair_cost = 1.0 - sim
+    candidate_counts = np.bincount(pair_later, minlength=n_later)  # Per-anomaly candidate count for uniqueness scoring
 
     # Solve globally optimal 1-to-1 assignment via the Hungarian algorithm
-    row_ind, col_ind = linear_sum_assignment(cost_matrix)
-
-    # Build match results -- skip pairs whose cost still equals the sentinel
-    matches = []
-    matched_later = set()
-    matched_earlier = set()
-
-    for i, j in zip(row_ind, col_ind):
-        if cost_matrix[i, j] >= (1.0 - LOW_CONFIDENCE):
-            continue  # Skip poor matches
-
-        sim = 1.0 - cost_matrix[i, j]
-        a_l = anom_later.iloc[i]
-        a_e = anom_earlier.iloc[j]
-
-        # Compute confidence
-        confidence = _compute_confidence(
-            sim, candidate_counts[i], a_l, a_e, years_between
+    row_ind, col_ind, assigned_cost = _solve_assignment(pair_later, pair_earlier, pair_cost, n_later, n_earlier)
+
+    # Skip poor matches, then score the confidence of all the rest at once
+    keep = assigned_cost < (1.0 - LOW_CONFIDENCE)
+    row_ind, col_ind = row_ind[keep], col_ind[keep]
+    similarities = 1.0 - assigned_cost[keep]
+    confidences = _compute_confidence(
+        similarities, candidate_counts[row_ind],
+        later["depth_pct"][row_ind], earlier["depth_pct"][col_ind],
+        later["joint_number"][row_ind], earlier["joint_number"][col_ind],
+        years_between,
+    )
+    conf_labels = _classify_confidence(confidences)
+
+    # Build match results
+    if len(row_ind):
+        matches_df = _build_matches_frame(
+            anom_later, anom_earlier, later, earlier, row_ind, col_ind,
+            similarities, confidences, conf_labels, years_between,
         )
-        conf_label = _classify_confidence(confidence)
-
-        match_record = _build_match_record(a_l, a_e, sim, confidence, conf_label, years_between)
-        matches.append(match_record)
-        matched_later.add(i)
-        matched_earlier.add(j)
+    else:
+        matches_df = pd.DataFrame()
 
-    matches_df = pd.DataFrame(matches) if matches else pd.DataFrame()
+    # Flag the matched anomalies of each run
+    matched_later = np.zeros(n_later, dtype=bool)
+    matched_later[row_ind] = True
+    matched_earlier = np.zeros(n_earlier, dtype=bool)
+    matched_earlier[col_ind] = True
 
     # Unmatched later-run anomalies -> new (first appearance in this run)
-    new_idx = [i for i in range(n_later) if i not in matched_later]
+    new_idx = np.flatnonzero(~matched_later)
     # Unmatched earlier-run anomalies -> missing (not seen in the newer run)
-    missing_idx = [i for i in range(n_earlier) if i not in matched_earlier]
-    new_anomalies = anom_later.iloc[new_idx].copy() if new_idx else pd.DataFrame()
-    missing_anomalies = anom_earlier.iloc[missing_idx].copy() if missing_idx else pd.DataFrame()
+    missing_idx = np.flatnonzero(~matched_earlier)
+    new_anomalies = anom_later.take(new_idx) if len(new_idx) else pd.DataFrame()
+    missing_anomalies = anom_earlier.take(missing_idx) if len(missing_idx) else pd.DataFrame()
 
     # Aggregate dashboard statistics
     stats = _compute_match_stats(matches_df, new_anomalies, missing_anomalies)
@@ -283,6 +321,39 @@ def match_anomalies(
 
 # ── Internal helpers ──────────────────────────────────────────────────────────
 
+# Numeric anomaly columns read by the candidate checks, similarity scoring,
+# the confidence model and the computed match-table columns
+_SCORING_COLUMNS = (
+    "corrected_distance", "log_distance_ft", "clock_hours", "depth_pct",
+    "length_in", "width_in", "joint_number",
+)
+
+
+def _anomaly_arrays(df: pd.DataFrame) -> dict[str, np.ndarray]:
+    """Extract the scoring columns of an anomaly table as arrays.
+
+    Numeric columns come back as float arrays (all-NaN when missing) and
+    "event_type" as an object array ("" when missing).
+    """
+    arrays = {
+        col: df[col].to_numpy(dtype=float) if col in df.columns else np.full(len(df), np.nan)
+        for col in _SCORING_COLUMNS
+    }
+    if "event_type" in df.columns:
+        arrays["event_type"] = df["event_type"].to_numpy(dtype=object)
+    else:
+        arrays["event_type"] = np.full(len(df), "", dtype=object)
+    return arrays
+
+
+# Scale of the (cos, sin) clock axes of the search space: the chord between
+# two clock positions CLOCK_TOLERANCE_HOURS apart becomes DISTANCE_TOLERANCE_FT
+# long, the same as the distance tolerance.  Unscaled, the unit clock circle
+# is dwarfed by the distance axis and the clock offset barely narrows the
+# search.
+_CLOCK_AXIS_SCALE = DISTANCE_TOLERANCE_FT / (2 * np.sin(np.pi * min(CLOCK_TOLERANCE_HOURS, 6.0) / 12.0))
+
+
 def _build_search_points(df: pd.DataFrame) -> np.ndarray:
     """Build an (N, 3) array of search points for the KD-tree.
 
@@ -291,29 +362,136 @@ def _build_search_points(df: pd.DataFrame) -> np.ndarray:
     axes are the trigonometric encoding of the clock-hour position so that
     Euclidean distance in this 3-D space captures both along-pipe proximity
     and circumferential proximity, with correct wraparound at 12/0 o'clock.
+    The clock axes are scaled by _CLOCK_AXIS_SCALE so both tolerances cover
+    the same length.  Built column-wise; the trig encoding is clock_to_trig
+    value for value (before scaling), including the (0, 0) origin for
+    unknown clock positions.
     """
-    points = np.zeros((len(df), 3))
-    for i, (_, row) in enumerate(df.iterrows()):
-        cos_c, sin_c = clock_to_trig(row.get("clock_hours", np.nan))
-        points[i] = [row["corrected_distance"], cos_c, sin_c]
+    hours = df["clock_hours"].to_numpy(dtype=float) if "clock_hours" in df.columns else np.full(len(df), np.nan)
+    theta = hours * 2 * np.pi / 12.0
+    unknown = np.isnan(hours)
+    points = np.empty((len(df), 3))
+    points[:, 0] = df["corrected_distance"].to_numpy(dtype=float)
+    points[:, 1] = np.where(unknown, 0.0, np.cos(theta)) * _CLOCK_AXIS_SCALE
+    points[:, 2] = np.where(unknown, 0.0, np.sin(theta)) * _CLOCK_AXIS_SCALE
     return points
 
 
-def _build_search_point_single(row: pd.Series) -> np.ndarray:
-    """Build a single 3-D search point (distance, cos_clock, sin_clock)."""
-    cos_c, sin_c = clock_to_trig(row.get("clock_hours", np.nan))
-    return np.array([row["corrected_distance"], cos_c, sin_c])
+# Sentinel cost -- prevents the solver from selecting non-candidate pairs
+_LARGE_COST = 1e6
+
+
+def _solve_assignment(
+    pair_later: np.ndarray,
+    pair_earlier: np.ndarray,
+    pair_cost: np.ndarray,
+    n_later: int,
+    n_earlier: int,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Min-cost 1-to-1 assignment over the candidate pairs.
+
+    Only candidate pairs can be matched, so the bipartite candidate graph
+    splits into independent connected components (clusters of nearby
+    anomalies).  Each component is solved on its own small dense cost
+    matrix, with non-candidate cells set to a large sentinel so the solver
+    never picks them; the union is an optimal assignment for the whole run,
+    without the O(n_later x n_earlier) matrix.
+
+    Returns (later index, earlier index, cost) of every assigned candidate
+    pair, in later-index order.
+    """
+    if len(pair_later) == 0:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty, np.empty(0)
+
+    # Nodes 0..n_later-1 are later anomalies, the rest earlier anomalies
+    graph = coo_matrix(
+        (np.ones(len(pair_later)), (pair_later, n_later + pair_earlier)),
+        shape=(n_later + n_earlier, n_later + n_earlier),
+    )
+    _, labels = connected_components(graph, directed=False)
+
+    comp = labels[pair_later]
+
+    # A component with a single candidate pair needs no solver: that pair is
+    # its assignment
+    single = np.bincount(comp)[comp] == 1
+    rows, cols, costs = [pair_later[single]], [pair_earlier[single]], [pair_cost[single]]
+
+    # Group the remaining pairs by component; each component's cost matrix
+    # has its later / earlier anomalies as rows / columns in index order
+    multi = np.flatnonzero(~single)
+    multi = multi[np.argsort(comp[multi], kind="stable")]
+    pair_later, pair_earlier, pair_cost, comp = pair_later[multi], pair_earlier[multi], pair_cost[multi], comp[multi]
+    local_row = _index_within_group(comp, pair_later, n_later)
+    local_col = _index_within_group(comp, pair_earlier, n_earlier)
+    bounds = np.flatnonzero(np.diff(comp)) + 1
+    starts = np.r_[0, bounds] if len(comp) else bounds
+
+    for start, stop in zip(starts.tolist(), np.r_[starts[1:], len(comp)].tolist()):
+        comp_row, comp_col = local_row[start:stop], local_col[start:stop]
+        shape = (comp_row.max() + 1, comp_col.max() + 1)
+        cost_matrix = np.full(shape, _LARGE_COST)
+        cost_matrix[comp_row, comp_col] = pair_cost[start:stop]
+        pair_at = np.full(shape, -1)
+        pair_at[comp_row, comp_col] = np.arange(start, stop)
+        row_ind, col_ind = _linear_assignment(cost_matrix)
+
+        # Skip cells that are not candidate pairs (sentinel cost)
+        assigned = pair_at[row_ind, col_ind]
+        assigned = assigned[assigned >= 0]
+        rows.append(pair_later[assigned])
+        cols.append(pair_earlier[assigned])
+        costs.append(pair_cost[assigned])
+
+    rows, cols, costs = np.concatenate(rows), np.concatenate(cols), np.concatenate(costs)
+    order = np.argsort(rows)
+    return rows[order], cols[order], costs[order]
+
+
+def _index_within_group(groups: np.ndarray, ids: np.ndarray, n_ids: int) -> np.ndarray:
+    """Position of each id among the distinct ids of its group, in id order."""
+    keys, inverse = np.unique(groups * n_ids + ids, return_inverse=True)
+    key_groups = keys // n_ids
+    return (np.arange(len(keys)) - np.searchsorted(key_groups, key_groups))[inverse]
+
+
+def _linear_assignment(cost_matrix: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Solve a (possibly rectangular) min-cost assignment, as linear_sum_assignment.
+
+    Uses the Jonker-Volgenant solver from `lap` when it is installed, which
+    is faster on larger matrices.  lapjv needs a square matrix, so the
+    missing rows / columns are padded with the sentinel cost and rows
+    assigned to padding are dropped; padding costs the same as a
+    non-candidate cell, so the optimum is unchanged.  Where several
+    assignments tie for the optimum the two solvers may pick different ones.
+    """
+    if not HAS_LAP:
+        return linear_sum_assignment(cost_matrix)
+    n_rows, n_cols = cost_matrix.shape
+    n = max(n_rows, n_cols)
+    square = np.full((n, n), _LARGE_COST)
+    square[:n_rows, :n_cols] = cost_matrix
+    _, x, _ = lapjv(square)
+    row_ind = np.flatnonzero(x[:n_rows] < n_cols)
+    return row_ind, x[row_ind]
 
 
 def _compute_confidence(
-    similarity: float,
-    n_candidates: int,
-    a_later: pd.Series,
-    a_earlier: pd.Series,
+    similarity: np.ndarray,
+    n_candidates: np.ndarray,
+    d_later: np.ndarray,
+    d_earlier: np.ndarray,
+    jn_later: np.ndarray,
+    jn_earlier: np.ndarray,
     years_between: float,
-) -> float:
+) -> np.ndarray:
     """Compute match confidence from a 4-factor weighted model.
 
+    Takes one array element per match (similarity, the later anomaly's
+    candidate count, both depths and both joint numbers) and returns the
+    confidences rounded to 4 places.
+
     The four factors and their weights:
       - Similarity  (40%) -- raw multi-attribute similarity score.
       - Uniqueness  (25%) -- fewer candidates within the search window means
@@ -324,128 +502,153 @@ def _compute_confidence(
         extreme growth reduces confidence.
       - Joint number agreement (15%) -- matching joint numbers provide
         independent confirmation that the pair is correct.
+
+    All four factors are computed in one compiled loop when numba is available.
     """
+    if HAS_NUMBA:
+        confidence = np.empty(len(similarity))
+        _matching_numba.confidence_kernel(similarity, n_candidates.astype(np.int64), d_later, d_earlier,
+                                          jn_later, jn_earlier, float(years_between),
+                                          float(MAX_PLAUSIBLE_GROWTH_RATE), confidence)
+        return np.round(confidence, 4)
+
     # Factor 1: Raw similarity (40%)
     f_sim = similarity
 
     # Factor 2: Uniqueness -- fewer candidates = less ambiguity (25%)
-    if n_candidates <= 1:
-        f_unique = 1.0
-    elif n_candidates == 2:
-        f_unique = 0.7
-    else:
-        f_unique = max(0.3, 1.0 - n_candidates * 0.1)
+    f_unique = np.select(
+        [n_candidates <= 1, n_candidates == 2],
+        [1.0, 0.7],
+        np.maximum(0.3, 1.0 - n_candidates * 0.1),
+    )
 
     # Factor 3: Growth plausibility -- penalise implausible depth changes (20%)
-    d_l = a_later.get("depth_pct", np.nan)
-    d_e = a_earlier.get("depth_pct", np.nan)
-    if not np.isnan(d_l) and not np.isnan(d_e) and years_between > 0:
-        growth_rate = (d_l - d_e) / years_between
-        if 0 <= growth_rate <= MAX_PLAUSIBLE_GROWTH_RATE:
-            f_plaus = 1.0
-        elif growth_rate < 0:
-            f_plaus = max(0, 0.5 + growth_rate / 10.0)
-        else:
-            f_plaus = max(0.2, 1.0 - (growth_rate - MAX_PLAUSIBLE_GROWTH_RATE) / 10.0)
-    else:
-        f_plaus = 0.5
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth_rate = (d_later - d_earlier) / years_between
+    f_plaus = np.select(
+        [(growth_rate >= 0) & (growth_rate <= MAX_PLAUSIBLE_GROWTH_RATE), growth_rate < 0],
+        [1.0, np.maximum(0.0, 0.5 + growth_rate / 10.0)],
+        np.maximum(0.2, 1.0 - (growth_rate - MAX_PLAUSIBLE_GROWTH_RATE) / 10.0),
+    )
+    if not years_between > 0:
+        f_plaus = np.full(len(similarity), 0.5)
+    f_plaus = np.where(np.isnan(d_later) | np.isnan(d_earlier), 0.5, f_plaus)
 
     # Factor 4: Joint number agreement -- independent spatial confirmation (15%)
-    jn_l = a_later.get("joint_number", np.nan)
-    jn_e = a_earlier.get("joint_number", np.nan)
-    if not np.isnan(jn_l) and not np.isnan(jn_e):
-        f_joint = 1.0 if int(jn_l) == int(jn_e) else 0.6
-    else:
-        f_joint = 0.5
+    f_joint = np.where(np.trunc(jn_later) == np.trunc(jn_earlier), 1.0, 0.6)
+    f_joint = np.where(np.isnan(jn_later) | np.isnan(jn_earlier), 0.5, f_joint)
 
     confidence = 0.40 * f_sim + 0.25 * f_unique + 0.20 * f_plaus + 0.15 * f_joint
-    return round(confidence, 4)
-
-
-def _classify_confidence(confidence: float) -> str:
-    """Map a numeric confidence score to a HIGH / MEDIUM / LOW label."""
-    if confidence >= HIGH_CONFIDENCE:
-        return "HIGH"
-    elif confidence >= MEDIUM_CONFIDENCE:
-        return "MEDIUM"
-    else:
-        return "LOW"
-
-
-def _build_match_record(
-    a_later: pd.Series,
-    a_earlier: pd.Series,
-    similarity: float,
-    confidence: float,
-    conf_label: str,
+    return np.round(confidence, 4)
+
+
+def _classify_confidence(confidence: np.ndarray) -> list[str]:
+    """Map numeric confidence scores to HIGH / MEDIUM / LOW labels."""
+    return np.select(
+        [confidence >= HIGH_CONFIDENCE, confidence >= MEDIUM_CONFIDENCE],
+        ["HIGH", "MEDIUM"],
+        "LOW",
+    ).tolist()
+
+
+def _build_matches_frame(
+    anom_later: pd.DataFrame,
+    anom_earlier: pd.DataFrame,
+    later: dict[str, np.ndarray],
+    earlier: dict[str, np.ndarray],
+    row_ind: np.ndarray,
+    col_ind: np.ndarray,
+    similarity: np.ndarray,
+    confidence: np.ndarray,
+    conf_label: list[str],
     years_between: float,
-) -> dict:
-    """Assemble the full match record dictionary for one anomaly pair.
+) -> pd.DataFrame:
+    """Assemble the match table, one row per (later row_ind[k], earlier col_ind[k]) pair.
 
     Combines data from both the earlier and later run (positions, depths,
     dimensions, event types, comments, wall thickness, original row indices)
     together with the computed similarity / confidence scores and annualised
-    growth rates (depth, length, width).  This record is the primary output
+    growth rates (depth, length, width).  This table is the primary output
     consumed by the dashboard and downstream reporting.
+
+    Built column by column from the anomaly arrays (`later` / `earlier` are
+    their _anomaly_arrays() columns); the growth columns keep Python's
+    round(), which can differ from np.round on near-ties.
     """
+    def later_col(col):
+        return _take_column(anom_later, col, row_ind)
+
+    def earlier_col(col):
+        return _take_column(anom_earlier, col, col_ind)
+
     # Growth calculations -- difference (later minus earlier) for each dimension
-    depth_growth = _safe_sub(a_later.get("depth_pct"), a_earlier.get("depth_pct"))
-    length_growth = _safe_sub(a_later.get("length_in"), a_earlier.get("length_in"))
-    width_growth = _safe_sub(a_later.get("width_in"), a_earlier.get("width_in"))
+    depth_growth = later["depth_pct"][row_ind] - earlier["depth_pct"][col_ind]
+    length_growth = later["length_in"][row_ind] - earlier["length_in"][col_ind]
+    width_growth = later["width_in"][row_ind] - earlier["width_in"][col_ind]
 
     # Annualised growth rates (units per year)
-    depth_rate = depth_growth / years_between if not np.isnan(depth_growth) else np.nan
-    length_rate = length_growth / years_between if not np.isnan(length_growth) else np.nan
-    width_rate = width_growth / years_between if not np.isnan(width_growth) else np.nan
+    depth_rate = depth_growth / years_between
+    length_rate = length_growth / years_between
+    width_rate = width_growth / years_between
 
-    return {
-        "similarity": round(similarity, 4),
+    return pd.DataFrame({
+        "similarity": np.round(similarity, 4),
         "confidence": confidence,
         "confidence_label": conf_label,
         # Earlier run
-        "earlier_year": a_earlier.get("run_year"),
-        "earlier_joint": a_earlier.get("joint_number"),
-        "earlier_distance": round(a_earlier.get("corrected_distance", np.nan), 2),
-        "earlier_orig_distance": round(a_earlier.get("log_distance_ft", np.nan), 2),
-        "earlier_clock": round(a_earlier.get("clock_hours", np.nan), 2),
-        "earlier_depth_pct": a_earlier.get("depth_pct"),
-        "earlier_length_in": a_earlier.get("length_in"),
-        "earlier_width_in": a_earlier.get("width_in"),
-        "earlier_event_type": a_earlier.get("event_type"),
-        "earlier_id_od": a_earlier.get("id_od"),
-        "earlier_comments": a_earlier.get("comments"),
-        "earlier_wall_thickness": a_earlier.get("wall_thickness_in"),
-        "earlier_row_idx": a_earlier.get("source_row_idx"),
+        "earlier_year": earlier_col("run_year"),
+        "earlier_joint": earlier_col("joint_number"),
+        "earlier_distance": np.round(earlier["corrected_distance"][col_ind], 2),
+        "earlier_orig_distance": np.round(earlier["log_distance_ft"][col_ind], 2),
+        "earlier_clock": np.round(earlier["clock_hours"][col_ind], 2),
+        "earlier_depth_pct": earlier_col("depth_pct"),
+        "earlier_length_in": earlier_col("length_in"),
+        "earlier_width_in": earlier_col("width_in"),
+        "earlier_event_type": earlier_col("event_type"),
+        "earlier_id_od": earlier_col("id_od"),
+        "earlier_comments": earlier_col("comments"),
+        "earlier_wall_thickness": earlier_col("wall_thickness_in"),
+        "earlier_row_idx": earlier_col("source_row_idx"),
         # Later run
-        "later_year": a_later.get("run_year"),
-        "later_joint": a_later.get("joint_number"),
-        "later_distance": round(a_later.get("corrected_distance", np.nan), 2),
-        "later_orig_distance": round(a_later.get("log_distance_ft", np.nan), 2),
-        "later_clock": round(a_later.get("clock_hours", np.nan), 2),
-        "later_depth_pct": a_later.get("depth_pct"),
-        "later_length_in": a_later.get("length_in"),
-        "later_width_in": a_later.get("width_in"),
-        "later_event_type": a_later.get("event_type"),
-        "later_id_od": a_later.get("id_od"),
-        "later_comments": a_later.get("comments"),
-        "later_wall_thickness": a_later.get("wall_thickness_in"),
-        "later_row_idx": a_later.get("source_row_idx"),
+        "later_year": later_col("run_year"),
+        "later_joint": later_col("joint_number"),
+        "later_distance": np.round(later["corrected_distance"][row_ind], 2),
+        "later_orig_distance": np.round(later["log_distance_ft"][row_ind], 2),
+        "later_clock": np.round(later["clock_hours"][row_ind], 2),
+        "later_depth_pct": later_col("depth_pct"),
+        "later_length_in": later_col("length_in"),
+        "later_width_in": later_col("width_in"),
+        "later_event_type": later_col("event_type"),
+        "later_id_od": later_col("id_od"),
+        "later_comments": later_col("comments"),
+        "later_wall_thickness": later_col("wall_thickness_in"),
+        "later_row_idx": later_col("source_row_idx"),
         # Growth
-        "years_between": years_between,
-        "depth_growth_pct": round(depth_growth, 2) if not np.isnan(depth_growth) else np.nan,
-        "depth_growth_rate": round(depth_rate, 3) if not np.isnan(depth_rate) else np.nan,
-        "length_growth_in": round(length_growth, 2) if not np.isnan(length_growth) else np.nan,
-        "length_growth_rate": round(length_rate, 3) if not np.isnan(length_rate) else np.nan,
-        "width_growth_in": round(width_growth, 2) if not np.isnan(width_growth) else np.nan,
-        "width_growth_rate": round(width_rate, 3) if not np.isnan(width_rate) else np.nan,
-    }
+        "years_between": [years_between] * len(row_ind),
+        "depth_growth_pct": _round_values(depth_growth, 2),
+        "depth_growth_rate": _round_values(depth_rate, 3),
+        "length_growth_in": _round_values(length_growth, 2),
+        "length_growth_rate": _round_values(length_rate, 3),
+        "width_growth_in": _round_values(width_growth, 2),
+        "width_growth_rate": _round_values(width_rate, 3),
+    })
+
+
+def _take_column(df: pd.DataFrame, col: str, idx: np.ndarray):
+    """Values of df[col] at row positions idx (None for a missing column).
+
+    Object values (strings, categories) come back as a list so the match
+    table infers their dtype as a list of records would.
+    """
+    if col not in df.columns:
+        return [None] * len(idx)
+    values = df[col].to_numpy()[idx]
+    return values.tolist() if values.dtype == object else values
 
 
-def _safe_sub(a, b) -> float:
-    """Subtract b from a, returning NaN if either value is missing."""
-    if pd.isna(a) or pd.isna(b):
-        return np.nan
-    return float(a) - float(b)
+def _round_values(values: np.ndarray, ndigits: int) -> list[float]:
+    """Python's round(v, ndigits) per value (NaN stays NaN)."""
+    return [round(v, ndigits) for v in values.tolist()]
 
 
 def _compute_match_stats(matches_df, new_df, missing_df) -> dict:
@@ -462,13 +665,16 @@ def _compute_match_stats(matches_df, new_df, missing_df) -> dict:
         "missing_anomalies": len(missing_df),
     }
     if len(matches_df) > 0:
-        stats["high_confidence"] = (matches_df["confidence_label"] == "HIGH").sum()
-        stats["medium_confidence"] = (matches_df["confidence_label"] == "MEDIUM").sum()
-        stats["low_confidence"] = (matches_df["confidence_label"] == "LOW").sum()
-        stats["avg_similarity"] = round(matches_df["similarity"].mean(), 3)
-        stats["avg_confidence"] = round(matches_df["confidence"].mean(), 3)
+        # Each column is pulled out once and reduced as a NumPy array
+        labels = matches_df["confidence_label"].to_numpy()
+        stats["high_confidence"] = (labels == "HIGH").sum()
+        stats["medium_confidence"] = (labels == "MEDIUM").sum()
+        stats["low_confidence"] = (labels == "LOW").sum()
+        stats["avg_similarity"] = round(matches_df["similarity"].to_numpy().mean(), 3)
+        stats["avg_confidence"] = round(matches_df["confidence"].to_numpy().mean(), 3)
         if "depth_growth_rate" in matches_df.columns:
-            valid_rates = matches_df["depth_growth_rate"].dropna()
+            rates = matches_df["depth_growth_rate"].to_numpy(dtype=float)
+            valid_rates = rates[~np.isnan(rates)]
             stats["avg_depth_growth_rate"] = round(valid_rates.mean(), 3) if len(valid_rates) > 0 else np.nan
             stats["negative_growth_count"] = (valid_rates < 0).sum()
             stats["high_growth_count"] = (valid_rates > MAX_PLAUSIBLE_GROWTH_RATE).sum()
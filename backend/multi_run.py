@@ -95,16 +95,17 @@ def chain_three_runs(
     # matches_12: later = y2 run, earlier = y1 run
 
     # Key: y2 row_idx -> y1 match info (the row from matches_12)
+    # (itertuples: plain namedtuples, no per-row Series construction)
     y2_to_y1 = {}
-    for _, m12 in matches_12.iterrows():
-        y2_row = m12["later_row_idx"]  # This is the y2 anomaly
+    for m12 in matches_12.itertuples(index=False):
+        y2_row = m12.later_row_idx  # This is the y2 anomaly
         y2_to_y1[y2_row] = m12
 
     # Walk through pair 2-3 matches; when the y2 side also exists in the
     # y2_to_y1 lookup, we have a triple match spanning all 3 runs.
     triple_records = []
-    for _, m23 in matches_23.iterrows():
-        y2_row = m23["earlier_row_idx"]  # The y2 anomaly in this match
+    for m23 in matches_23.itertuples(index=False):
+        y2_row = m23.earlier_row_idx  # The y2 anomaly in this match
 
         if y2_row in y2_to_y1:
             m12 = y2_to_y1[y2_row]
@@ -113,35 +114,35 @@ def chain_three_runs(
                 # Tracking
                 "lifecycle": "Tracked All 3 Runs",
                 # Y1 (earliest) data
-                f"joint_{y1}": m12["earlier_joint"],
-                f"distance_{y1}": m12["earlier_distance"],
-                f"clock_{y1}": m12["earlier_clock"],
-                f"depth_{y1}": m12["earlier_depth_pct"],
-                f"length_{y1}": m12["earlier_length_in"],
-                f"width_{y1}": m12["earlier_width_in"],
-                f"row_idx_{y1}": m12["earlier_row_idx"],
+                f"joint_{y1}": m12.earlier_joint,
+                f"distance_{y1}": m12.earlier_distance,
+                f"clock_{y1}": m12.earlier_clock,
+                f"depth_{y1}": m12.earlier_depth_pct,
+                f"length_{y1}": m12.earlier_length_in,
+                f"width_{y1}": m12.earlier_width_in,
+                f"row_idx_{y1}": m12.earlier_row_idx,
                 # Y2 (middle) data
-                f"joint_{y2}": m23["earlier_joint"],
-                f"distance_{y2}": m23["earlier_distance"],
-                f"clock_{y2}": m23["earlier_clock"],
-                f"depth_{y2}": m23["earlier_depth_pct"],
-                f"length_{y2}": m23["earlier_length_in"],
-                f"width_{y2}": m23["earlier_width_in"],
-                f"row_idx_{y2}": m23["earlier_row_idx"],
+                f"joint_{y2}": m23.earlier_joint,
+                f"distance_{y2}": m23.earlier_distance,
+                f"clock_{y2}": m23.earlier_clock,
+                f"depth_{y2}": m23.earlier_depth_pct,
+                f"length_{y2}": m23.earlier_length_in,
+                f"width_{y2}": m23.earlier_width_in,
+                f"row_idx_{y2}": m23.earlier_row_idx,
                 # Y3 (latest) data
-                f"joint_{y3}": m23["later_joint"],
-                f"distance_{y3}": m23["later_distance"],
-                f"clock_{y3}": m23["later_clock"],
-                f"depth_{y3}": m23["later_depth_pct"],
-                f"length_{y3}": m23["later_length_in"],
-                f"width_{y3}": m23["later_width_in"],
-                f"row_idx_{y3}": m23["later_row_idx"],
+                f"joint_{y3}": m23.later_joint,
+                f"distance_{y3}": m23.later_distance,
+                f"clock_{y3}": m23.later_clock,
+                f"depth_{y3}": m23.later_depth_pct,
+                f"length_{y3}": m23.later_length_in,
+                f"width_{y3}": m23.later_width_in,
+                f"row_idx_{y3}": m23.later_row_idx,
                 # Confidence (min of both matches)
-                "confidence_12": m12["confidence"],
-                "confidence_23": m23["confidence"],
-                "min_confidence": min(m12["confidence"], m23["confidence"]),
+                "confidence_12": m12.confidence,
+                "confidence_23": m23.confidence,
+                "min_confidence": min(m12.confidence, m23.confidence),
                 # Overall growth
-                "total_depth_growth": _safe_sub(m23["later_depth_pct"], m12["earlier_depth_pct"]),
+                "total_depth_growth": _safe_sub(m23.later_depth_pct, m12.earlier_depth_pct),
                 "total_years": YEARS_BETWEEN.get((y1, y3), y3 - y1),
             }
             triple_records.append(record)
@@ -11,27 +11,36 @@ dashboard analytics, runtime AI configuration, and file-upload pipeline re-runs.
 """
 
 import os
+import json
 import threading
 import numpy as np
 import pandas as pd
 from fastapi import FastAPI, UploadFile, File as FastAPIFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from pydantic import BaseModel
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 from data_ingestion import (
-    load_all_runs, load_summary, get_anomalies, get_girth_welds,
-    data_quality_report, column_completeness,
+    load_workbook, get_anomalies, get_girth_welds,
+    summarize_run, data_quality_report, column_completeness,
 )
-from alignment import match_girth_welds, apply_distance_correction, compute_alignment_stats
+from alignment import match_girth_welds, apply_distance_correction
 from matching import match_anomalies
 from growth import calculate_growth_rates, growth_summary_stats, top_concerns
 from multi_run import run_full_analysis, export_results
 from config import YEARS_BETWEEN, RUN_YEARS
 from ai_service import (
-    chat, generate_executive_report, generate_anomaly_narratives,
-    generate_chart_insights, generate_nl_chart,
-    set_api_key, get_api_key_status,
+    chat_async, generate_executive_report_async, generate_anomaly_narratives_async,
+    generate_chart_insights_async, generate_nl_chart_async,
+    generate_dashboard_bundle_async,
+    chat_stream_async, generate_executive_report_stream_async,
+    set_api_key, get_api_key_status, invalidate_context_cache,
 )
 from virtual_ili import predict_future_inspection
 from integrity_analytics import compute_integrity_dashboard
@@ -93,6 +102,16 @@ def _nan_to_none(obj):
     return obj
 
 
+async def _sse(chunks):
+    """Wrap an async text-chunk iterator as server-sent events.
+
+    Each chunk is JSON-encoded into a single `data:` line so newlines in the
+    markdown survive the event framing.
+    """
+    async for text in chunks:
+        yield f"data: {json.dumps(text)}\n\n"
+
+
 def _df_to_records(df: pd.DataFrame) -> list[dict]:
     """Convert a DataFrame to a JSON-serializable list of dicts.
 
@@ -105,6 +124,17 @@ def _df_to_records(df: pd.DataFrame) -> list[dict]:
     return [_nan_to_none(r) for r in records]
 
 
+def _with_growth_metrics(matches: pd.DataFrame) -> pd.DataFrame:
+    """Add the growth metrics to a pair's matches, highest risk_score first.
+
+    The cached match tables are kept in risk order so the AI context
+    builders and narratives can take the top N with head(n); the stable
+    sort keeps ties in match order, exactly as nlargest would.
+    """
+    matches = calculate_growth_rates(matches)
+    return matches.sort_values("risk_score", ascending=False, kind="stable").reset_index(drop=True)
+
+
 @app.on_event("startup")
 def startup():
     """Load data and run the full 5-step analysis pipeline on startup.
@@ -117,9 +147,8 @@ def startup():
 
     All results are stored in `cache` so API endpoints return instantly.
     """
-    runs = load_all_runs(DATA_PATH)
-    summary = load_summary(DATA_PATH)
-    gw_alignment = match_girth_welds(runs)
+    runs, summary = load_workbook(DATA_PATH)
+    gw_alignment, alignment_stats = match_girth_welds(runs, return_stats=True)
     corrected_runs = apply_distance_correction(runs, gw_alignment)
     results = run_full_analysis(corrected_runs)
 
@@ -127,14 +156,18 @@ def startup():
     for key in results.get("pairwise", {}):
         matches = results["pairwise"][key].get("matches", pd.DataFrame())
         if not matches.empty:
-            results["pairwise"][key]["matches"] = calculate_growth_rates(matches)
+            results["pairwise"][key]["matches"] = _with_growth_metrics(matches)
 
     cache["runs"] = runs
+    cache["run_summaries"] = {year: summarize_run(df) for year, df in runs.items()}
     cache["summary"] = summary
     cache["gw_alignment"] = gw_alignment
     cache["corrected_runs"] = corrected_runs
     cache["results"] = results
-    cache["alignment_stats"] = compute_alignment_stats(gw_alignment)
+    cache["alignment_stats"] = alignment_stats
+    # Bump the version so memoized AI context strings are rebuilt
+    cache["version"] = cache.get("version", 0) + 1
+    invalidate_context_cache()
 
 
 # ── API Endpoints ─────────────────────────────────────────────────────────────
@@ -149,7 +182,7 @@ def get_summary():
     run_info = []
     for year in sorted(runs.keys()):
         df = runs[year]
-        anom = get_anomalies(df)
+        anom = get_anomalies(df, copy=False)
         gw = get_girth_welds(df)
         info = {
             "year": year,
@@ -172,8 +205,10 @@ def get_summary():
 def get_quality():
     """Data quality report and column completeness."""
     runs = cache["runs"]
-    dq = data_quality_report(runs)
-    comp = column_completeness(runs)
+    # Filter anomalies once per run and share them between both reports
+    anomalies = {year: get_anomalies(df, copy=False) for year, df in runs.items()}
+    dq = data_quality_report(runs, anomalies)
+    comp = column_completeness(runs, anomalies)
     return {
         "quality_report": _df_to_records(dq),
         "completeness": _df_to_records(comp),
@@ -190,10 +225,12 @@ def get_eda():
 
     for year in sorted(runs.keys()):
         df = runs[year]
-        anom = get_anomalies(df)
+        anom = get_anomalies(df, copy=False)
 
         # Event type counts
         evt_counts = df[df["is_anomaly"]]["event_type"].value_counts()
+        # event_type is categorical: drop the categories absent from this run
+        evt_counts = evt_counts[evt_counts > 0]
         result["event_types"][str(year)] = evt_counts.to_dict()
 
         # Distributions (raw values for frontend to bin)
@@ -309,14 +346,20 @@ def get_multirun():
     trajectories = []
     if not triple.empty and "overall_growth_rate" in triple.columns:
         top10 = triple.nlargest(10, "overall_growth_rate")
-        for _, row in top10.iterrows():
+        # Missing columns come through as NaN (-> None) via reindex
+        traj_cols = ["joint_2022", "depth_2007", "depth_2015", "depth_2022",
+                     "linear_rate", "predicted_2030"]
+        traj_rows = top10.reindex(columns=traj_cols).assign(
+            is_accelerating=top10.get("is_accelerating", False)
+        )
+        for joint, d07, d15, d22, rate, pred_2030, accel in traj_rows.itertuples(index=False, name=None):
             traj = {
-                "joint": row.get("joint_2022"),
-                "depths": [row.get("depth_2007"), row.get("depth_2015"), row.get("depth_2022")],
+                "joint": joint,
+                "depths": [d07, d15, d22],
                 "years": [2007, 2015, 2022],
-                "linear_rate": row.get("linear_rate"),
-                "predicted_2030": row.get("predicted_2030"),
-                "is_accelerating": row.get("is_accelerating", False),
+                "linear_rate": rate,
+                "predicted_2030": pred_2030,
+                "is_accelerating": accel,
             }
             trajectories.append(traj)
 
@@ -339,7 +382,7 @@ def get_pipeline_view():
     # Anomalies per run
     anomalies_by_run = {}
     for year in sorted(corrected_runs.keys()):
-        anom = get_anomalies(corrected_runs[year])
+        anom = get_anomalies(corrected_runs[year], copy=False)
         anomalies_by_run[str(year)] = anom[[
             "corrected_distance", "clock_hours", "depth_pct",
             "event_type", "joint_number",
@@ -351,14 +394,19 @@ def get_pipeline_view():
         matches = mr.get("matches", pd.DataFrame())
         if matches.empty:
             continue
-        for _, m in matches.iterrows():
+        pair = f"{ye}-{yl}"
+        conn_cols = ["earlier_distance", "earlier_clock", "later_distance",
+                     "later_clock", "confidence_label"]
+        for e_dist, e_clock, l_dist, l_clock, conf in (
+            matches.reindex(columns=conn_cols).itertuples(index=False, name=None)
+        ):
             connections.append({
-                "earlier_dist": m.get("earlier_distance"),
-                "earlier_clock": m.get("earlier_clock"),
-                "later_dist": m.get("later_distance"),
-                "later_clock": m.get("later_clock"),
-                "confidence": m.get("confidence_label"),
-                "pair": f"{ye}-{yl}",
+                "earlier_dist": e_dist,
+                "earlier_clock": e_clock,
+                "later_dist": l_dist,
+                "later_clock": l_clock,
+                "confidence": conf,
+                "pair": pair,
             })
 
     # Girth weld positions (2022 reference)
@@ -402,6 +450,13 @@ class InsightRequest(BaseModel):
     data: dict
 
 
+# Pydantic request model for the combined dashboard AI call: narratives plus
+# one insight set per chart (and optionally the report) in a single LLM call.
+class BundleRequest(BaseModel):
+    charts: list[InsightRequest] = []
+    include_report: bool = False
+
+
 # Pydantic request model for natural-language-to-Plotly chart generation.
 class NLChartRequest(BaseModel):
     query: str
@@ -410,45 +465,76 @@ class NLChartRequest(BaseModel):
 # --- AI Chat: conversational copilot for asking questions about the data ---
 
 @app.post("/api/chat")
-def api_chat(req: ChatRequest):
+async def api_chat(req: ChatRequest):
     """AI copilot chat — ask questions about pipeline data in plain English."""
-    response = chat(req.message, req.history, cache)
+    response = await chat_async(req.message, req.history, cache)
     return {"response": response}
 
 
+@app.post("/api/chat/stream")
+async def api_chat_stream(req: ChatRequest):
+    """Streaming AI copilot chat (server-sent events, one JSON string per event)."""
+    return StreamingResponse(
+        _sse(chat_stream_async(req.message, req.history, cache)),
+        media_type="text/event-stream",
+    )
+
+
 # --- AI Report: auto-generated executive summary of the full analysis ---
 
 @app.get("/api/ai-report")
-def api_ai_report():
+async def api_ai_report():
     """Generate AI executive summary report."""
-    report = generate_executive_report(cache)
+    report = await generate_executive_report_async(cache)
     return {"report": report}
 
 
+@app.get("/api/ai-report/stream")
+async def api_ai_report_stream():
+    """Stream the AI executive summary report (server-sent events)."""
+    return StreamingResponse(
+        _sse(generate_executive_report_stream_async(cache)),
+        media_type="text/event-stream",
+    )
+
+
 # --- AI Narratives: plain-English explanations for top concern anomalies ---
 
 @app.get("/api/ai-narratives")
-def api_ai_narratives():
+async def api_ai_narratives():
     """Generate AI narrative cards for top concern anomalies."""
-    narratives = generate_anomaly_narratives(cache)
+    narratives = await generate_anomaly_narratives_async(cache)
     return _nan_to_none({"narratives": narratives})
 
 
 # --- AI Insights: contextual annotations for any chart ---
 
 @app.post("/api/ai-insights")
-def api_ai_insights(req: InsightRequest):
+async def api_ai_insights(req: InsightRequest):
     """Generate AI chart annotations/insights."""
-    annotations = generate_chart_insights(req.chart_type, req.data, cache)
+    annotations = await generate_chart_insights_async(req.chart_type, req.data, cache)
     return {"annotations": annotations}
 
 
+# --- AI Bundle: narratives + chart insights (+ report) in one LLM round-trip ---
+# Backend-only for now: the dashboard loads narratives and streams the report
+# from separate user actions, and it requests no chart insights, so it has
+# no bundled call to make. Kept for API clients that need several at once.
+
+@app.post("/api/ai-bundle")
+async def api_ai_bundle(req: BundleRequest):
+    """Generate narratives, chart insights and optionally the report in one AI call."""
+    charts = [{"chart_type": c.chart_type, "data": c.data} for c in req.charts]
+    result = await generate_dashboard_bundle_async(cache, charts, req.include_report)
+    return _nan_to_none(result)
+
+
 # --- AI Natural-Language Chart: generate a Plotly chart spec from plain English ---
 
 @app.post("/api/nl-chart")
-def api_nl_chart(req: NLChartRequest):
+async def api_nl_chart(req: NLChartRequest):
     """Generate a Plotly chart from natural language."""
-    result = generate_nl_chart(req.query, cache)
+    result = await generate_nl_chart_async(req.query, cache)
     return _nan_to_none(result)
 
 
@@ -465,12 +551,28 @@ def api_virtual_ili(year: int):
 # Segment-level risk heatmap, ASME B31G burst-pressure assessment, prioritised
 # dig list, and population-level corrosion growth analytics.
 
+# (dashboard result, its JSON body): the dashboard is memoized per cache
+# version, so the serialized body can be reused for as long as the same
+# result object comes back.
+_dashboard_body = (None, b"")
+
+
 @app.get("/api/integrity-dashboard")
 def api_integrity_dashboard():
     """Segment risk heatmap, ASME B31G interaction assessment,
     automated dig list, and population growth analytics."""
+    global _dashboard_body
     result = compute_integrity_dashboard(cache)
-    return _nan_to_none(result)
+    if not HAS_ORJSON:
+        return _nan_to_none(result)
+    # orjson writes numpy scalars natively and NaN as null, so the segment
+    # and dig-list records go straight to bytes without the _nan_to_none
+    # copy and FastAPI's jsonable_encoder walk
+    cached_result, body = _dashboard_body
+    if cached_result is not result:
+        body = orjson.dumps(result, option=orjson.OPT_SERIALIZE_NUMPY)
+        _dashboard_body = (result, body)
+    return Response(content=body, media_type="application/json")
 
 
 # ── API Key Configuration ─────────────────────────────────────────────────────
@@ -483,7 +585,7 @@ class ApiKeyRequest(BaseModel):
 
 @app.post("/api/set-api-key")
 def api_set_api_key(req: ApiKeyRequest):
-    """Set the xAI API key at runtime (validates before accepting)."""
+    """Set the xAI API key at runtime (accepted immediately, validated in the background)."""
     result = set_api_key(req.key)
     return {"status": "ok" if result.get("configured") else "error", **result}
 
@@ -517,8 +619,7 @@ def _run_pipeline_background(file_path: str):
         # Step 1: Load data
         pipeline_progress.update({"step": "Loading ILI data from Excel...", "step_number": 1})
         pipeline_progress["stats"]["filename"] = os.path.basename(file_path)
-        runs = load_all_runs(file_path)
-        summary = load_summary(file_path)
+        runs, summary = load_workbook(file_path)
         total_rows = sum(len(df) for df in runs.values())
         run_years = sorted(runs.keys())
         pipeline_progress["stats"]["total_rows"] = total_rows
@@ -526,7 +627,7 @@ def _run_pipeline_background(file_path: str):
 
         # Step 2: Match girth welds
         pipeline_progress.update({"step": "Matching girth welds across runs...", "step_number": 2})
-        gw_alignment = match_girth_welds(runs)
+        gw_alignment, alignment_stats = match_girth_welds(runs, return_stats=True)
         pipeline_progress["stats"]["girth_welds_matched"] = len(gw_alignment)
 
         # Step 3: Apply distance correction
@@ -547,11 +648,10 @@ def _run_pipeline_background(file_path: str):
         for key in results.get("pairwise", {}):
             matches = results["pairwise"][key].get("matches", pd.DataFrame())
             if not matches.empty:
-                results["pairwise"][key]["matches"] = calculate_growth_rates(matches)
+                results["pairwise"][key]["matches"] = _with_growth_metrics(matches)
 
         # Step 6: Finalize — build new cache and swap atomically
         pipeline_progress.update({"step": "Finalizing results...", "step_number": 6})
-        alignment_stats = compute_alignment_stats(gw_alignment)
 
         chain = results.get("chain", {})
         triple = chain.get("triple_matches", pd.DataFrame())
@@ -560,13 +660,16 @@ def _run_pipeline_background(file_path: str):
         # Atomically update cache
         new_cache = {
             "runs": runs,
+            "run_summaries": {year: summarize_run(df) for year, df in runs.items()},
             "summary": summary,
             "gw_alignment": gw_alignment,
             "corrected_runs": corrected_runs,
             "results": results,
             "alignment_stats": alignment_stats,
+            "version": cache.get("version", 0) + 1,
         }
         cache.update(new_cache)
+        invalidate_context_cache()
 
         pipeline_progress.update({"status": "completed", "step": "Pipeline analysis complete!"})
 
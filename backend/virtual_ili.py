@@ -55,10 +55,29 @@ def predict_future_inspection(cache: dict, target_year: int) -> dict:
     if years_forward <= 0:
         return {"error": "Target year must be after 2022"}
 
+    # Index the 3-run regression rates by 2022 joint once (first triple match
+    # per joint) so each anomaly is a dict lookup rather than a frame scan.
+    triple_rates = {}
+    if not triple.empty and "linear_rate" in triple.columns:
+        first = triple.drop_duplicates("joint_2022")
+        triple_rates = dict(zip(first["joint_2022"].tolist(), first["linear_rate"].to_numpy()))
+
+    # Walk the needed columns in lockstep as plain tuples (as
+    # itertuples(name=None) would) rather than building a Series per row;
+    # absent columns read as their defaults
+    event_col = "later_event_type" if "later_event_type" in matches.columns else "event_type"
+    rows = zip(
+        _column(matches, "later_depth_pct", np.nan),
+        _column(matches, "depth_growth_rate", np.nan),
+        _column(matches, "later_joint"),
+        _column(matches, "later_distance"),
+        _column(matches, "later_clock"),
+        _column(matches, event_col, "Metal Loss"),
+        _column(matches, "confidence_label", "Unknown"),
+    )
+
     predictions = []
-    for _, row in matches.iterrows():
-        current_depth = row.get("later_depth_pct", np.nan)
-        growth_rate = row.get("depth_growth_rate", np.nan)
+    for current_depth, growth_rate, joint, distance, clock, event_type, confidence in rows:
 
         if pd.isna(current_depth) or pd.isna(growth_rate):
             continue
@@ -67,14 +86,10 @@ def predict_future_inspection(cache: dict, target_year: int) -> dict:
         # over three runs is more reliable than a single pairwise delta.
         refined_rate = growth_rate
         is_triple = False
-        if not triple.empty:
-            j = row.get("later_joint")
-            tm = triple[triple["joint_2022"] == j]
-            if not tm.empty:
-                lr = tm.iloc[0].get("linear_rate", np.nan)
-                if not pd.isna(lr):
-                    refined_rate = lr
-                    is_triple = True
+        lr = triple_rates.get(joint, np.nan)
+        if not pd.isna(lr):
+            refined_rate = lr
+            is_triple = True
 
         # Skip anomalies with negative growth rates (measurement artifacts,
         # not real wall recovery -- wall loss does not reverse in practice)
@@ -103,16 +118,16 @@ def predict_future_inspection(cache: dict, target_year: int) -> dict:
             risk = "Low"
 
         predictions.append({
-            "joint": _safe(row.get("later_joint")),
-            "distance_ft": _safe(row.get("later_distance")),
-            "clock": _safe(row.get("later_clock")),
+            "joint": _safe(joint),
+            "distance_ft": _safe(distance),
+            "clock": _safe(clock),
             "current_depth_2022": round(current_depth, 1),
             "growth_rate": round(refined_rate, 3),
             "predicted_depth": round(predicted_depth, 1),
             "predicted_risk": risk,
             "years_to_80pct": round(years_to_threshold, 1) if years_to_threshold is not None else None,
-            "event_type": row.get("later_event_type", row.get("event_type", "Metal Loss")),
-            "confidence": row.get("confidence_label", "Unknown"),
+            "event_type": event_type,
+            "confidence": confidence,
             "is_triple_tracked": is_triple,
         })
 
@@ -170,6 +185,13 @@ def predict_future_inspection(cache: dict, target_year: int) -> dict:
     }
 
 
+def _column(df: pd.DataFrame, name: str, default=None):
+    """Iterate a column's values, or `default` per row if the column is absent."""
+    if name in df.columns:
+        return df[name]
+    return [default] * len(df)
+
+
 def _safe(v):
     """Convert numpy scalar types to native Python types for JSON serialization.
 
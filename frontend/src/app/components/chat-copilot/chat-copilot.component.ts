@@ -281,6 +281,7 @@ export class ChatCopilotComponent implements OnInit {
           this.apiKeyError = '';
           this.showConnectedBanner = true;
           setTimeout(() => { this.showConnectedBanner = false; }, 5000);
+          if (res.status === 'validating') this.watchKeyValidation();
         } else {
           this.apiKeyError = res.error || 'Invalid API key. Make sure it starts with "xai-".';
         }
@@ -292,12 +293,32 @@ export class ChatCopilotComponent implements OnInit {
     });
   }
 
+  /** Polls the AI status while the backend validates a new key; reports it if rejected. */
+  private watchKeyValidation(attempt = 0): void {
+    if (attempt >= 15) return;
+    setTimeout(() => {
+      this.api.getAiStatus().subscribe({
+        next: (res: any) => {
+          if (res.status === 'validating') {
+            this.watchKeyValidation(attempt + 1);
+          } else if (res.rejected) {
+            // The backend restored the previous key (if any) on rejection
+            this.aiConfigured = res.configured;
+            this.showConnectedBanner = false;
+            this.apiKeyError = 'Invalid API key. Get yours at https://console.x.ai';
+          }
+        },
+        error: () => {}
+      });
+    }, 1000);
+  }
+
   /** Sends a pre-built comprehensive summary prompt to the AI copilot. */
   summarizeResults(): void {
     this.sendMessage('Provide a comprehensive summary of all pipeline analysis results, including key findings, risk hotspots, growth trends, and recommended actions.');
   }
 
-  /** Sends the user message with chat history to the AI copilot endpoint. */
+  /** Sends the user message with chat history to the AI copilot endpoint, streaming the reply. */
   sendMessage(text?: string): void {
     const msg = text || this.userInput.trim();
     if (!msg) return;
@@ -306,13 +327,15 @@ export class ChatCopilotComponent implements OnInit {
     this.userInput = '';
     this.isLoading = true;
 
-    this.api.chat(msg, this.messages.slice(0, -1)).subscribe({
-      next: (res: any) => {
-        this.messages.push({ role: 'assistant', content: res.response });
-        this.isLoading = false;
-      },
+    // Stream the reply so the first tokens appear while the rest is generated
+    const reply = { role: 'assistant', content: '' };
+    const history = this.messages.slice(0, -1);
+    this.messages.push(reply);
+    this.api.streamChat(msg, history).subscribe({
+      next: (chunk: string) => { reply.content += chunk; },
+      complete: () => { this.isLoading = false; },
       error: () => {
-        this.messages.push({ role: 'assistant', content: 'Sorry, I encountered an error. Please try again.' });
+        reply.content = 'Sorry, I encountered an error. Please try again.';
         this.isLoading = false;
       }
     });
@@ -255,14 +255,16 @@ export class GrowthComponent implements OnInit {
     });
   }
 
-  /** Requests an AI-generated executive report from the backend. */
+  /** Requests an AI-generated executive report from the backend, streaming it in. */
   generateReport(): void {
     this.reportLoading = true;
-    this.api.getAiReport().subscribe({
-      next: (res: any) => {
-        this.aiReport = res.report;
-        this.reportLoading = false;
+    this.aiReport = null;
+    // Render the report progressively as it streams in
+    this.api.streamAiReport().subscribe({
+      next: (chunk: string) => {
+        this.aiReport = (this.aiReport || '') + chunk;
       },
+      complete: () => { this.reportLoading = false; },
       error: () => {
         this.aiReport = 'Failed to generate report. Please check the backend.';
         this.reportLoading = false;
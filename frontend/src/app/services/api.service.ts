@@ -69,11 +69,25 @@ export class ApiService {
     return this.http.post(`${BASE}/chat`, { message, history });
   }
 
+  /** Streams the AI chat reply as text chunks while it is generated. POST /api/chat/stream */
+  streamChat(message: string, history: { role: string; content: string }[]): Observable<string> {
+    return this.streamEvents(`${BASE}/chat/stream`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ message, history }),
+    });
+  }
+
   /** Generates a comprehensive AI-written integrity report for the current dataset. GET /api/ai-report */
   getAiReport(): Observable<any> {
     return this.http.get(`${BASE}/ai-report`);
   }
 
+  /** Streams the AI integrity report as text chunks while it is generated. GET /api/ai-report/stream */
+  streamAiReport(): Observable<string> {
+    return this.streamEvents(`${BASE}/ai-report/stream`, { method: 'GET' });
+  }
+
   /** Fetches AI-generated plain-language narratives summarising each analysis section. GET /api/ai-narratives */
   getAiNarratives(): Observable<any> {
     return this.http.get(`${BASE}/ai-narratives`);
@@ -122,4 +136,39 @@ export class ApiService {
   getPipelineStatus(): Observable<any> {
     return this.http.get(`${BASE}/run-pipeline/status`);
   }
+
+  // ── Streaming helper ──────────────────────────────────────────────────────
+
+  /**
+   * Reads a server-sent-event stream via fetch (HttpClient cannot stream
+   * response bodies) and emits the JSON-decoded `data:` payload of each event.
+   * Unsubscribing aborts the request.
+   */
+  private streamEvents(url: string, init: RequestInit): Observable<string> {
+    return new Observable<string>(subscriber => {
+      const controller = new AbortController();
+      fetch(url, { ...init, signal: controller.signal })
+        .then(async res => {
+          if (!res.ok || !res.body) throw new Error(`HTTP ${res.status}`);
+          const reader = res.body.getReader();
+          const decoder = new TextDecoder();
+          let buffer = '';
+          while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            const events = buffer.split('\n\n');
+            buffer = events.pop() ?? '';
+            for (const evt of events) {
+              if (evt.startsWith('data: ')) subscriber.next(JSON.parse(evt.slice(6)));
+            }
+          }
+          subscriber.complete();
+        })
+        .catch(err => {
+          if (!controller.signal.aborted) subscriber.error(err);
+        });
+      return () => controller.abort();
+    });
+  }
 }